@@ -1,5 +1,5 @@
 import tkinter as tk
-from tkinter import ttk, scrolledtext, messagebox
+from tkinter import ttk, messagebox
 import yaml
 from pathlib import Path
 import MetaTrader5 as mt5
@@ -7,6 +7,8 @@ import threading
 import time
 import importlib
 import logging
+import collections
+import concurrent.futures
 from datetime import datetime, timezone, timedelta
 import pytz
 import sys
@@ -23,11 +25,18 @@ from src.simulation.engine import SimulationEngine
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 log = logging.getLogger(__name__) # Logger específico para GUI
 
+_TS_CACHE = [0, ""] # [segundo epoch, string formatada]: reutiliza o timestamp de linhas no mesmo segundo
+
 class TradingDashboard(tk.Tk):
+    _LOG_MAX_LINES = 2000 # Janela deslizante do log (evita crescimento ilimitado do widget Text)
+    _MT5_VERIFY_INTERVAL_S = 300 # Intervalo entre verificações da conexão MT5 do monitor
+    _DEFAULT_TFS = ("D1", "H1", "M15", "M5") # Opções de timeframe da simulação (já ordenadas)
+
     def __init__(self):
         super().__init__()
         self.title("WtnpsTrade Dashboard v2.6 - Simulação Histórica (UTC-3)")
         self.geometry("1000x800")
+        self._alive = True # Falso após _on_closing/TclError; substitui winfo_exists() nos callbacks agendados
 
         # --- Carrega Configuração ---
         try:
@@ -38,23 +47,31 @@ class TradingDashboard(tk.Tk):
             ]
             if not self.assets_config:
                  log.warning("Nenhum ativo habilitado encontrado na configuração.")
+            # (data_ticker, order_ticker, timeframe_str) pré-resolvidos para _create_asset_widgets
+            self._assets_flat = []
+            for asset in self.assets_config:
+                data_ticker = asset.get('ticker', 'N/A'); live_cfg = asset.get('live_trading') or {}
+                self._assets_flat.append((data_ticker, live_cfg.get('ticker_order', data_ticker), live_cfg.get('timeframe_str', 'D1')))
         except Exception as e:
             log.critical(f"Erro fatal ao carregar configuração: {e}", exc_info=True)
             messagebox.showerror("Erro de Configuração", f"Não foi possível carregar 'configs/main.yaml'.\nErro: {e}")
             self.destroy(); return
 
         self.checkbox_vars = {}; self.timeframe_comboboxes = {}
-        self.market_data_labels = {}; self.auto_refresh_var = tk.BooleanVar(value=True)
+        self.auto_refresh_var = tk.BooleanVar(value=True)
+        # Registro de labels do monitor: ticker -> linha e matriz (N_tickers, 7) de widgets
+        self._label_index = {}; self._labels = np.empty((0, 7), dtype=object)
+        self._last_values = collections.defaultdict(dict) # linha -> {coluna: último valor exibido}
         self.refresh_countdown = tk.IntVar(value=60); self.market_data_running = False
         self.monitor_mt5_connected = False # Flag para status da conexão do monitor
+        self._mt5_last_verified = 0.0 # time.monotonic() da última verificação OK da conexão MT5
+        self._log_buf = collections.deque() # Buffer de linhas de log (flush em lote)
 
-        # --- Instancia o SimulationEngine ---
-        try:
-            self.simulation_engine = SimulationEngine()
-        except Exception as e:
-             log.critical(f"Erro fatal ao inicializar SimulationEngine: {e}", exc_info=True)
-             messagebox.showerror("Erro de Inicialização", f"Não foi possível inicializar o motor de simulação.\nErro: {e}")
-             self.destroy(); return
+        # --- SimulationEngine é instanciado em background (ver _init_engine) ---
+        self.simulation_engine = None
+        self._engine_ready = threading.Event()
+        # Pool único para todo trabalho em background (init do engine, monitor, simulação)
+        self._exec = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="dash")
 
         # --- Layout Principal ---
         self.main_frame = ttk.Frame(self, padding="10")
@@ -94,13 +111,21 @@ class TradingDashboard(tk.Tk):
         self.asset_selection_frame.pack(side=tk.TOP, fill=tk.X, pady=5)
         simulate_button = ttk.Button(sim_frame, text="Executar Simulação", command=self._trigger_simulation)
         simulate_button.pack(side=tk.TOP, pady=10)
+        self.engine_status_label = ttk.Label(sim_frame, text="Motor de simulação: carregando...", foreground="orange")
+        self.engine_status_label.pack(side=tk.TOP)
 
         # --- Frame Logs ---
         log_frame = ttk.LabelFrame(self.main_frame, text="Log da Simulação", padding="10")
         log_frame.pack(side=tk.BOTTOM, fill=tk.BOTH, expand=True, pady=5)
-        self.log_text = scrolledtext.ScrolledText(log_frame, wrap=tk.WORD, height=15, font=("Consolas", 9))
-        self.log_text.pack(expand=True, fill=tk.BOTH)
+        # tk.Text simples (sem histórico de undo/autoseparators) + scrollbar ttk
+        self.log_text = tk.Text(log_frame, wrap=tk.WORD, height=15, font=("Consolas", 9),
+                                undo=False, autoseparators=False, maxundo=0)
+        log_scrollbar = ttk.Scrollbar(log_frame, command=self.log_text.yview)
+        self.log_text['yscrollcommand'] = log_scrollbar.set
+        log_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.log_text.pack(side=tk.LEFT, expand=True, fill=tk.BOTH)
         self.log_text.configure(state='disabled')
+        self.after(50, self._flush_log) # Inicia o flusher do log (um insert a cada 50 ms)
 
         # --- Inicialização do Monitor ---
         self.monitor_mt5_connected = self._connect_mt5_monitor() # Tenta conectar para o monitor
@@ -111,19 +136,54 @@ class TradingDashboard(tk.Tk):
              self.log_message("ERRO: Monitor de mercado não iniciado (falha conexão MT5). Simulação ainda pode funcionar.")
 
         self.protocol("WM_DELETE_WINDOW", self._on_closing)
+        # Aquece o motor de simulação em paralelo ao primeiro desenho da janela
+        self._exec.submit(self._init_engine)
+
+    def _init_engine(self):
+        """Instancia o SimulationEngine fora da thread da UI e sinaliza quando estiver pronto."""
+        try:
+            self.simulation_engine = SimulationEngine()
+        except Exception as e:
+            log.critical(f"Erro fatal ao inicializar SimulationEngine: {e}", exc_info=True)
+            self.after(0, self._on_engine_failed, e)
+            return
+        self._engine_ready.set()
+        self.after(0, lambda: self.engine_status_label.config(text="Motor de simulação: pronto", foreground="green"))
+
+    def _on_engine_failed(self, error):
+        """Informa a falha de inicialização do motor (executa na thread da UI)."""
+        self.engine_status_label.config(text="Motor de simulação: falha na inicialização", foreground="red")
+        messagebox.showerror("Erro de Inicialização", f"Não foi possível inicializar o motor de simulação.\nErro: {error}")
 
     # --- Funções de Log e Conexão (Monitor) ---
     def log_message(self, message):
-        """Adiciona uma mensagem ao ScrolledText da GUI, thread-safe."""
-        if not hasattr(self, 'log_text') or not self.log_text.winfo_exists(): return
-        def _update_log():
-             try:
-                 self.log_text.configure(state='normal')
-                 self.log_text.insert(tk.END, f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} - {message}\n")
-                 self.log_text.see(tk.END)
-                 self.log_text.configure(state='disabled')
-             except tk.TclError: pass
-        self.after(0, _update_log)
+        """Enfileira uma mensagem para o widget de log da GUI, thread-safe.
+
+        As linhas são acumuladas em um deque e escritas em lote por _flush_log,
+        evitando um after(0) + 4 chamadas Tcl por linha durante rajadas de log.
+        """
+        sec = int(time.time())
+        if sec != _TS_CACHE[0]:
+            _TS_CACHE[0] = sec; _TS_CACHE[1] = datetime.fromtimestamp(sec).strftime('%Y-%m-%d %H:%M:%S')
+        self._log_buf.append(f"{_TS_CACHE[1]} - {message}\n")
+
+    def _flush_log(self):
+        """Escreve as linhas pendentes no widget de log com um único insert e reagenda."""
+        if not self._alive: return
+        if self._log_buf:
+            # popleft limitado ao tamanho atual: linhas anexadas durante o flush ficam para o próximo ciclo
+            text = "".join(self._log_buf.popleft() for _ in range(len(self._log_buf)))
+            try:
+                self.log_text.configure(state='normal')
+                self.log_text.insert(tk.END, text)
+                n_lines = int(self.log_text.index('end-1c').split('.')[0])
+                if n_lines > self._LOG_MAX_LINES:
+                    self.log_text.delete('1.0', f"{n_lines - self._LOG_MAX_LINES}.0")
+                self.log_text.see(tk.END)
+                self.log_text.configure(state='disabled')
+            except tk.TclError: self._alive = False; return # Janela fechando
+        try: self.after(50, self._flush_log)
+        except tk.TclError: self._alive = False
 
     def _connect_mt5_monitor(self):
         """Inicializa a conexão com o MetaTrader 5 especificamente para o monitor."""
@@ -131,6 +191,7 @@ class TradingDashboard(tk.Tk):
             log.error(f"Monitor: Falha na inicialização do MT5: {mt5.last_error()}")
             return False
         log.info("Monitor: Conectado ao MetaTrader 5.")
+        self._mt5_last_verified = time.monotonic()
         return True
 
     def _disconnect_mt5_monitor(self):
@@ -147,13 +208,21 @@ class TradingDashboard(tk.Tk):
         # Limpa frames
         for widget in self.asset_selection_frame.winfo_children(): widget.destroy()
         for widget in self.market_data_frame.winfo_children(): widget.destroy()
-        self.market_data_labels.clear(); self.checkbox_vars.clear(); self.timeframe_comboboxes.clear()
+        self._label_index.clear(); self._last_values.clear(); self.checkbox_vars.clear(); self.timeframe_comboboxes.clear()
+        label_rows = [] # Linhas [ticker, open, high, low, last, avg, var] -> self._labels
+
+        # Estilos pré-definidos: evita repassar font/width/anchor a cada Label
+        style = ttk.Style(self)
+        style.configure("MonHdr.TLabel", font=('Arial', 9, 'bold'))
+        style.configure("Mon.TLabel", anchor="e", width=10)
+        # Suspende a propagação de geometria; as células são criadas primeiro e posicionadas num único passo
+        self.market_data_frame.grid_propagate(False)
+        cells = [] # (widget, row, column, sticky)
 
         # Cabeçalhos Monitor de Mercado
         headers = ["Ativo", "Abertura", "Máxima", "Mínima", "Último", "Médio", "Variação %"]
         for col, header in enumerate(headers):
-            lbl = ttk.Label(self.market_data_frame, text=header, font=('Arial', 9, 'bold'))
-            lbl.grid(row=0, column=col, padx=5, pady=2, sticky="w")
+            cells.append((ttk.Label(self.market_data_frame, text=header, style="MonHdr.TLabel"), 0, col, "w"))
 
         # Mensagem se o monitor falhou
         if monitor_failed:
@@ -164,21 +233,19 @@ class TradingDashboard(tk.Tk):
             ttk.Label(self.market_data_frame, text="Nenhum ativo habilitado na configuração.").grid(row=1, column=0, columnspan=len(headers))
             self.log_message("AVISO: Nenhum ativo habilitado encontrado em configs/main.yaml")
         else:
-            for row_idx, asset_config in enumerate(self.assets_config, start=1):
-                data_ticker = asset_config.get('ticker', 'N/A')
-                order_ticker = asset_config.get('live_trading', {}).get('ticker_order', data_ticker)
+            for row_idx, (data_ticker, order_ticker, configured_tf) in enumerate(self._assets_flat, start=1):
 
                 # Cria labels do monitor apenas se ele não falhou
-                if not monitor_failed:
-                    asset_labels = {}
+                if not monitor_failed and order_ticker not in self._label_index:
                     lbl_ticker = ttk.Label(self.market_data_frame, text=order_ticker, width=12)
-                    lbl_ticker.grid(row=row_idx, column=0, padx=5, pady=2, sticky="w")
-                    asset_labels['ticker'] = lbl_ticker
-                    for col_idx, key in enumerate(['open', 'high', 'low', 'last', 'avg', 'var'], start=1):
-                        lbl_data = ttk.Label(self.market_data_frame, text="-", width=10, anchor="e")
-                        lbl_data.grid(row=row_idx, column=col_idx, padx=5, pady=2, sticky="e")
-                        asset_labels[key] = lbl_data
-                    self.market_data_labels[order_ticker] = asset_labels
+                    cells.append((lbl_ticker, row_idx, 0, "w"))
+                    row_labels = [lbl_ticker]
+                    for col_idx in range(1, 7): # open, high, low, last, avg, var
+                        lbl_data = ttk.Label(self.market_data_frame, text="-", style="Mon.TLabel")
+                        cells.append((lbl_data, row_idx, col_idx, "e"))
+                        row_labels.append(lbl_data)
+                    self._label_index[order_ticker] = len(label_rows)
+                    label_rows.append(row_labels)
 
                 # Checkbox e Combobox para Simulação (sempre cria)
                 asset_sim_frame = ttk.Frame(self.asset_selection_frame)
@@ -187,17 +254,26 @@ class TradingDashboard(tk.Tk):
                 chk = ttk.Checkbutton(asset_sim_frame, text=data_ticker, variable=var)
                 chk.pack(side=tk.TOP, anchor='w')
                 self.checkbox_vars[data_ticker] = var
-                configured_tf = asset_config.get('live_trading', {}).get('timeframe_str', 'D1')
-                tf_options = sorted(list(set(["M5", "M15", "H1", "D1", configured_tf])))
+                tf_options = self._DEFAULT_TFS if configured_tf in self._DEFAULT_TFS else tuple(sorted(self._DEFAULT_TFS + (configured_tf,)))
                 tf_combo = ttk.Combobox(asset_sim_frame, values=tf_options, width=5, state="readonly")
                 tf_combo.set(configured_tf)
                 tf_combo.pack(side=tk.TOP, anchor='w', pady=(2,0))
                 self.timeframe_comboboxes[data_ticker] = tf_combo
 
+        self._labels = np.empty((len(label_rows), 7), dtype=object)
+        for i, row_labels in enumerate(label_rows): self._labels[i, :] = row_labels
+
+        # Posiciona todas as células de uma vez e faz um único relayout
+        for widget, row, col, sticky in cells:
+            widget.grid(row=row, column=col, padx=5, pady=2, sticky=sticky)
+        for col in range(len(headers)):
+            self.market_data_frame.columnconfigure(col, weight=1)
+        self.market_data_frame.grid_propagate(True)
+
     # --- Lógica de Atualização de Dados de Mercado (Monitor) ---
     def _start_market_data_updates(self):
         """Inicia o loop para atualizar os dados de mercado."""
-        if not self.market_data_labels:
+        if not self._label_index:
              log.warning("Monitor não iniciado (sem conexão MT5 inicial ou sem ativos habilitados).")
              return
         log.info("Iniciando thread de atualização do monitor de mercado.")
@@ -206,7 +282,7 @@ class TradingDashboard(tk.Tk):
 
     def _update_timer_and_data(self):
         """Atualiza o timer e dispara a busca de dados se necessário."""
-        if not self.market_data_running: return
+        if not self._alive or not self.market_data_running: return
 
         try:
             current_countdown = self.refresh_countdown.get()
@@ -226,13 +302,14 @@ class TradingDashboard(tk.Tk):
             else:
                 timer_text = "Auto Refresh: OFF"
 
-            if self.winfo_exists():
-                 self.timer_label.config(text=timer_text)
+            self.timer_label.config(text=timer_text)
 
+        except tk.TclError:
+             self._alive = False # Janela destruída
         except Exception as e:
              log.error(f"Erro no loop do timer: {e}", exc_info=True)
         finally:
-             if self.market_data_running and self.winfo_exists():
+             if self.market_data_running and self._alive:
                   self.after(1000, self._update_timer_and_data) # Reagenda
 
     def _manual_refresh(self):
@@ -258,42 +335,61 @@ class TradingDashboard(tk.Tk):
     def _fetch_and_update_market_data_threadsafe(self):
          """Inicia a busca de dados em uma thread separada."""
          if not self.monitor_mt5_connected: return # Não tenta se não conectado
-         log.debug("Disparando thread para buscar dados do monitor.")
-         refresh_thread = threading.Thread(target=self._fetch_and_update_market_data, daemon=True)
-         refresh_thread.start()
+         log.debug("Disparando busca de dados do monitor no pool.")
+         self._exec.submit(self._fetch_and_update_market_data)
 
     def _fetch_and_update_market_data(self):
         """Busca os dados de mercado e agenda atualização da GUI."""
-        # Garante conexão MT5 para esta thread (pode ser redundante se _connect_mt5_monitor já fez)
-        if not mt5.initialize(): # Tenta conectar se não estiver
-             log.warning("Monitor: Não foi possível (re)conectar ao MT5 para buscar dados.")
-             # Marca como desconectado para evitar novas tentativas imediatas
-             self.monitor_mt5_connected = False
-             self.after(0, lambda: ttk.Label(self.market_data_frame, text="Falha na conexão MT5.", foreground="red").grid(row=1, column=0, columnspan=7))
-             return
+        # Verifica a conexão MT5 só a cada _MT5_VERIFY_INTERVAL_S (ping via terminal_info, initialize como fallback)
+        now = time.monotonic()
+        if now - self._mt5_last_verified > self._MT5_VERIFY_INTERVAL_S:
+            ok = mt5.terminal_info() is not None or mt5.initialize()
+            self._mt5_last_verified = now if ok else 0.0
+            if not ok:
+                 log.warning("Monitor: Não foi possível (re)conectar ao MT5 para buscar dados.")
+                 # Marca como desconectado para evitar novas tentativas imediatas
+                 self.monitor_mt5_connected = False
+                 self.after(0, lambda: ttk.Label(self.market_data_frame, text="Falha na conexão MT5.", foreground="red").grid(row=1, column=0, columnspan=7))
+                 return
         self.monitor_mt5_connected = True # Marca como conectado
 
         log.debug("Monitor: Buscando dados de mercado...")
-        update_queue = []
-        for order_ticker, labels in self.market_data_labels.items():
-            data = {"open": "-", "high": "-", "low": "-", "last": "-", "avg": "-", "var": ("-", "black")} # Padrão
+        tickers = list(self._label_index) # Ordem de inserção == linha em self._labels
+        # Coleta em SoA (uma coluna por campo); NaN marca ticker sem dados válidos
+        quotes = np.full((len(tickers), 4), np.nan) # open, high, low, last
+        # Uma única chamada IPC traz bid/ask de todos os ativos; symbol_info_tick só para os ausentes
+        try: infos = {info.name: info for info in (mt5.symbols_get(group=",".join(tickers)) or ())}
+        except Exception as e:
+            log.warning(f"Monitor: Erro em symbols_get, usando symbol_info_tick por ativo: {e}"); infos = {}
+        for i, order_ticker in enumerate(tickers):
             try:
                 rates = mt5.copy_rates_from_pos(order_ticker, mt5.TIMEFRAME_D1, 0, 1)
-                tick = mt5.symbol_info_tick(order_ticker)
+                tick = infos.get(order_ticker) or mt5.symbol_info_tick(order_ticker)
 
                 if rates is not None and len(rates) > 0 and tick and tick.time > 0:
-                    lr = rates[0]; o, h, l = lr['open'], lr['high'], lr['low']
-                    lp = tick.last; avg = (h + l) / 2
-                    var = ((lp / o) - 1) * 100 if o > 0 else 0
-                    v_col = "green" if var >= 0 else "red"; v_txt = f"{var:+.2f}%"
-                    # Define os dados para atualização (formato com precisão maior)
-                    data = {"open": f"{o:.5f}", "high": f"{h:.5f}", "low": f"{l:.5f}",
-                            "last": f"{lp:.5f}", "avg": f"{avg:.5f}", "var": (v_txt, v_col)}
+                    lr = rates[0]
+                    # Ponto médio bid/ask como "último"; tick.last se o book estiver vazio
+                    lp = (tick.bid + tick.ask) / 2 if tick.bid > 0 and tick.ask > 0 else tick.last
+                    quotes[i] = (lr['open'], lr['high'], lr['low'], lp)
                 else: log.debug(f"Monitor: Dados inválidos/ausentes para {order_ticker}.")
             except Exception as e:
                 log.warning(f"Monitor: Erro ao buscar dados para {order_ticker}: {e}")
 
-            update_queue.append((labels, data)) # Adiciona à fila mesmo em caso de erro (com dados '-')
+        # Cálculo e formatação vetorizados (np.char.mod formata a coluna inteira em C)
+        o, h, l, lp = quotes.T
+        avg = (h + l) / 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            var = np.where(o > 0, ((lp / o) - 1) * 100, 0.0)
+        valid = ~np.isnan(quotes).any(axis=1)
+        # .tolist() converte cada coluna para str nativos de uma vez
+        columns = [np.char.mod("%.5f", col).tolist() for col in (o, h, l, lp, avg)]
+        var_s = np.char.mod("%+.2f%%", var).tolist()
+        var_c = np.where(var >= 0, "green", "red").tolist()
+
+        update_queue = []
+        for row_idx, (ok, *texts, vs, vc) in enumerate(zip(valid.tolist(), *columns, var_s, var_c)):
+            # Inclui tickers com erro (dados '-'); row_idx indexa self._labels
+            update_queue.append((row_idx, texts, (vs, vc)) if ok else (row_idx, ["-"] * 5, ("-", "black")))
 
         self.after(0, self._apply_gui_updates, update_queue)
         # Não desconecta, a conexão MT5 é global agora
@@ -301,22 +397,28 @@ class TradingDashboard(tk.Tk):
 
     def _apply_gui_updates(self, update_queue):
          """Aplica as atualizações pendentes na GUI."""
-         if not self.winfo_exists(): return
-         for labels, data in update_queue:
+         if not self._alive: return
+         labels = self._labels
+         for row_idx, texts, var in update_queue:
               try:
-                  labels['open'].config(text=data["open"])
-                  labels['high'].config(text=data["high"])
-                  labels['low'].config(text=data["low"])
-                  labels['last'].config(text=data["last"])
-                  labels['avg'].config(text=data["avg"])
-                  labels['var'].config(text=data["var"][0], foreground=data["var"][1])
-              except tk.TclError: log.warning("Erro Tcl ao atualizar label (janela fechando?).")
+                  row = labels[row_idx]; prev = self._last_values[row_idx]
+                  # Só reconfigura células cujo texto mudou desde o último refresh
+                  for col, text in enumerate(texts, start=1): # open, high, low, last, avg
+                      if prev.get(col) != text:
+                          row[col].config(text=text); prev[col] = text
+                  if prev.get(6) != var:
+                      row[6].config(text=var[0], foreground=var[1]); prev[6] = var
+              except tk.TclError:
+                  log.warning("Erro Tcl ao atualizar label (janela fechando?).")
+                  self._alive = False; return
               except Exception as e: log.error(f"Erro inesperado ao aplicar update GUI: {e}")
 
 
     # --- Lógica de Simulação ---
     def _trigger_simulation(self):
         """Dispara a simulação usando o SimulationEngine."""
+        if not self._engine_ready.is_set():
+            messagebox.showinfo("Aguarde", "Motor de simulação ainda carregando..."); return
         selected_tickers = [ticker for ticker, var in self.checkbox_vars.items() if var.get()]
         if not selected_tickers:
             messagebox.showwarning("Seleção Vazia", "Nenhum ativo selecionado para simulação."); return
@@ -356,10 +458,7 @@ class TradingDashboard(tk.Tk):
 
         self.log_message(f"Iniciando simulação via Engine para: {', '.join(selected_tickers)}")
         # Passa o datetime LOCAL (ou None) para a thread
-        sim_thread = threading.Thread(target=self._run_simulation_thread,
-                                      args=(selected_tickers, selected_timeframes, simulation_datetime_local),
-                                      daemon=True)
-        sim_thread.start()
+        self._exec.submit(self._run_simulation_thread, selected_tickers, selected_timeframes, simulation_datetime_local)
 
     def _run_simulation_thread(self, tickers_to_simulate, selected_timeframes, simulation_datetime_local):
         """Executa a simulação usando o SimulationEngine, passando o datetime LOCAL."""
@@ -425,13 +524,13 @@ class TradingDashboard(tk.Tk):
     def _on_closing(self):
         """Handler para fechar a janela."""
         log.info("Fechando dashboard...")
+        self._alive = False # Callbacks agendados passam a retornar imediatamente
         self.market_data_running = False # Para a thread de monitoramento
-        # Tenta aguardar a thread do monitor terminar
-        if hasattr(self, 'market_data_thread') and self.market_data_thread.is_alive():
-             try: self.market_data_thread.join(timeout=0.5)
-             except RuntimeError: pass
+        # Descarta tarefas pendentes do pool sem bloquear a UI
+        if hasattr(self, '_exec'):
+             self._exec.shutdown(wait=False, cancel_futures=True)
         # Desliga explicitamente o engine (que cuidará do MT5 shutdown)
-        if hasattr(self, 'simulation_engine'):
+        if getattr(self, 'simulation_engine', None) is not None:
              self.simulation_engine.shutdown()
         log.info("Desligamento concluído.")
         self.destroy()
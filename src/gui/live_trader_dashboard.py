@@ -1,16 +1,19 @@
 # src/gui/live_trader_dashboard.py
 
+import os
 import sys
-import yaml
+from functools import lru_cache, partial
 import logging
 from pathlib import Path
 from datetime import datetime, time, timedelta
 import pytz
-from queue import Queue, Empty
+from collections import deque
+from queue import SimpleQueue
 from threading import Thread
+from concurrent.futures import ThreadPoolExecutor
 
 import tkinter as tk
-from tkinter import ttk, messagebox, font as tkFont
+from tkinter import ttk, messagebox
 
 # Adiciona a raiz do projeto ao path para importações
 project_root = Path(__file__).resolve().parent.parent.parent
@@ -19,53 +22,102 @@ if str(project_root) not in sys.path:
 
 from src.live_trader import LiveTrader # Importa a classe LiveTrader
 from src.simulation.engine import SimulationEngine # Importa o SimulationEngine
+from src.utils.config_cache import load_yaml_config
 
 # Configuração do logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] (%(name)s) %(message)s')
 log = logging.getLogger(__name__)
 
+_DT_FMT = "%Y-%m-%d %H:%M:%S" # Formato do campo Data/Hora da simulação
+
+# --- Fusos horários (compartilhados entre instâncias) ---
+# zoneinfo (stdlib) dispensa o localize() do pytz; pytz fica como fallback sem base tzdata
+try:
+    from zoneinfo import ZoneInfo
+    LOCAL_TZ = ZoneInfo("America/Sao_Paulo")
+    UTC_TZ = ZoneInfo("UTC")
+    _USE_ZONEINFO = True
+except Exception: # ImportError ou ZoneInfoNotFoundError
+    try:
+        LOCAL_TZ = pytz.timezone('America/Sao_Paulo')
+    except pytz.UnknownTimeZoneError:
+        log.warning("Timezone 'America/Sao_Paulo' não encontrado, usando UTC.")
+        LOCAL_TZ = pytz.utc
+    UTC_TZ = pytz.utc
+    _USE_ZONEINFO = False
+
+@lru_cache(maxsize=8)
+def _load_config_cached(path, mtime):
+    """Parseia o YAML (sidecar JSON opcional, ver load_yaml_config); a chave inclui o mtime, então edições invalidam o cache."""
+    return load_yaml_config(path)
+
+def load_config(path):
+    """Carrega (memoizado por caminho+mtime) o config YAML. O dict retornado é compartilhado: não mutar."""
+    return _load_config_cached(path, os.path.getmtime(path))
+
 class LiveTraderDashboard(tk.Tk):
     """
     Interface gráfica (GUI) principal para o Live Trader, combinando
     o monitoramento ao vivo com a capacidade de simulação "market replay".
     """
+    _SIGNAL_STYLES = {"COMPRA": "Buy.TLabel", "VENDA": "Sell.TLabel"} # Demais sinais -> Hold.TLabel
+    _SIGNAL_TAGS = {"COMPRA": "buy", "VENDA": "sell"} # Tags do Treeview do popup; demais -> "hold"
+    _LOSSY_MSG_TYPES = frozenset({"update"}) # Mensagens de alta frequência que podem ser descartadas sob rajada
+
     def __init__(self, config_path="configs/main.yaml"):
         super().__init__()
         self.title("WTNPS Trade - Live Trader Dashboard")
         self.geometry("1400x800")
 
         # --- Configuração de Fuso Horário ---
-        try:
-            self.local_tz = pytz.timezone('America/Sao_Paulo')
-        except pytz.UnknownTimeZoneError:
-            log.warning("Timezone 'America/Sao_Paulo' não encontrado, usando UTC.")
-            self.local_tz = pytz.utc
-        self.utc_tz = pytz.utc
+        self.local_tz = LOCAL_TZ
+        self.utc_tz = UTC_TZ
 
         # --- Carregamento de Config ---
         self.config_path = config_path
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                self.config = yaml.safe_load(f)
+            self.config = load_config(self.config_path)
         except Exception as e:
-            log.critical(f"Erro fatal ao carregar config: {e}")
+            log.critical("Erro fatal ao carregar config: %s", e)
             messagebox.showerror("Erro de Configuração", f"Não foi possível carregar 'configs/main.yaml'.\n{e}")
             self.destroy()
             return
 
         # --- Estado da Aplicação ---
-        # Filtra assets que estão habilitados E têm configuração de live_trading habilitada
-        self.assets = [
-            asset['ticker'] for asset in self.config.get('assets', [])
-            if asset.get('enabled', True) and asset.get('live_trading', {}).get('enabled', False)
-        ]
+        # Passada única sobre config['assets']:
+        # - self.assets: ativos habilitados E com live_trading habilitado
+        # - self._asset_meta: tabela plana por ticker (todos os ativos do config, p/ cobrir também o popup
+        #   de simulação), evitando cadeias de .get() por tick em _update_asset_card/_update_asset_position
+        self.assets, self._asset_meta = [], {}
+        for a in self.config.get('assets', []):
+            ticker = a.get('ticker')
+            if not ticker: continue
+            live_cfg = a.get('live_trading') or {}
+            precision = a.get('price_precision', 2) # Mesma origem usada por LiveTrader/SimulationEngine
+            self._asset_meta[ticker] = {
+                'precision': precision,
+                'price_fmt': ("{:." + str(precision) + "f}").format, # Spec de formato montado uma única vez
+                'tf': live_cfg.get('timeframe_str', 'N/A'),
+                'live_cfg': live_cfg,
+            }
+            if a.get('enabled', True) and live_cfg.get('enabled', False):
+                self.assets.append(ticker)
+        self.assets_set = frozenset(self.assets) # Use para testes de pertinência (O(1)); self.assets mantém a ordem
         if not self.assets:
              log.warning("Nenhum ativo habilitado para Live Trading no 'configs/main.yaml'. O dashboard pode ficar vazio.")
              # Opcional: Mostrar um aviso na GUI
              # messagebox.showwarning("Aviso", "Nenhum ativo configurado e habilitado para Live Trading.")
 
         self.asset_widgets = {}
-        self.queue = Queue()
+        self._last_dt_parse = (None, None) # (texto, datetime aware) do último parse em _run_simulation
+        self._sim_popup = None # Toplevel de resultado da simulação (criado no 1º uso e reutilizado)
+        self._sim_tree = None
+        # Canais GUI (append/popleft são atômicos sob o GIL; consumidor único = loop Tk):
+        # ticks ("update") num deque limitado, que descarta os mais antigos sob rajada; status/posição/
+        # resultados/init num deque sem limite, para nunca perder mensagem de controle
+        self._deque = deque(maxlen=4096)
+        self._ctrl_deque = deque()
+        self._idle_delay = 100 # Intervalo atual (ms) do poll de _process_queue
 
         # --- Motores ---
         self.trader_engine = None
@@ -77,11 +129,17 @@ class LiveTraderDashboard(tk.Tk):
         self._setup_styles()
         self._create_widgets()
 
-        # --- Inicialização dos Motores em Threads Separadas ---
-        log.info("Iniciando thread de inicialização do LiveTrader...")
-        Thread(target=self._initialize_trader_engine, daemon=True).start()
-        log.info("Iniciando thread de inicialização do SimulationEngine...")
-        Thread(target=self._initialize_simulation_engine, daemon=True).start()
+        # --- Inicialização dos Motores (pool de init; cada término posta um "init_done" na fila) ---
+        log.info("Iniciando inicialização do LiveTrader e do SimulationEngine...")
+        self._init_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="init")
+        self._trader_fut = self._init_pool.submit(self._initialize_trader_engine)
+        self._trader_fut.add_done_callback(partial(self._post_init_done, "trader"))
+        self._sim_fut = self._init_pool.submit(self._initialize_simulation_engine)
+        self._sim_fut.add_done_callback(partial(self._post_init_done, "sim"))
+
+        # --- Worker persistente de simulação (evita criar uma thread por clique) ---
+        self._sim_jobs = SimpleQueue()
+        Thread(target=self._simulation_worker, daemon=True, name="DashboardSimWorker").start()
 
         self.after(100, self._process_queue)
         self.protocol("WM_DELETE_WINDOW", self._on_closing)
@@ -101,6 +159,9 @@ class LiveTraderDashboard(tk.Tk):
         self.hold_color = "orange"
         self.status_ok_color = "blue"
         self.status_err_color = "red"
+        # Nome de cor (mensagens da fila) -> cor efetiva; resolvido uma vez, sem style.lookup por mensagem
+        self._color_by_name = {"red": self.sell_color, "green": self.buy_color, "blue": self.status_ok_color,
+                               "orange": self.hold_color, "grey": self.fg_color}
 
         self.configure(bg=self.bg_color)
 
@@ -123,20 +184,39 @@ class LiveTraderDashboard(tk.Tk):
         self.style.configure("PositionFlat.TLabel", foreground=self.fg_color, background=self.frame_bg, font=("Segoe UI", 10), padding=2)
 
 
+    def _post_init_done(self, which, future):
+        """(Callback do pool) Posta um único evento de término da inicialização de um motor.
+
+        Para o trader, "ok" indica apenas que o LiveTrader foi instanciado; a prontidão final é
+        verificada no loop Tk por _check_trader_ready.
+        """
+        ok = future.exception() is None and (self.trader_engine is not None if which == "trader" else self.is_simulation_engine_initialized)
+        self.queue_put({"type": "init_done", "which": which, "ok": ok})
+
+
     def _initialize_trader_engine(self):
-        """(Thread) Instancia o LiveTrader e aguarda sua inicialização interna."""
+        """(Thread) Instancia o LiveTrader; o fim da init interna é acompanhado por _check_trader_ready."""
         log.info("Thread _initialize_trader_engine: Iniciando...")
         try:
-            # 1. Instancia o LiveTrader (dispara a thread _init_thread interna)
-            self.trader_engine = LiveTrader(config_path=self.config_path, callback=self.queue.put)
+            # Instancia o LiveTrader (dispara a thread _init_thread interna) e retorna sem aguardá-la
+            self.trader_engine = LiveTrader(config_path=self.config_path, callback=self.queue_put, config=self.config)
+        except Exception as e:
+            log.critical("Falha crítica ao instanciar LiveTrader: %s", e, exc_info=True)
+            self.is_trader_initialized = False
+            self.queue_put({"type": "status", "asset": "GLOBAL", "message": "Live CRÍTICO", "color": "red"})
+        finally:
+            log.info("Thread _initialize_trader_engine: Finalizada.")
 
-            # 2. **CORREÇÃO:** Espera a thread de inicialização interna do LiveTrader terminar
-            if hasattr(self.trader_engine, '_init_thread') and self.trader_engine._init_thread is not None:
-                log.info("Thread _initialize_trader_engine: Aguardando inicialização interna do LiveTrader...")
-                self.trader_engine._init_thread.join() # Aguarda o fim da thread
-                log.info("Thread _initialize_trader_engine: Inicialização interna do LiveTrader concluída.")
 
-            # 3. Verifica o estado após a inicialização interna
+    def _check_trader_ready(self):
+        """(Loop Tk) Verifica a cada 200 ms se a init interna do LiveTrader terminou, sem bloquear uma thread em join()."""
+        init_thread = getattr(self.trader_engine, '_init_thread', None)
+        if init_thread is not None and init_thread.is_alive():
+            self.after(200, self._check_trader_ready)
+            return
+        log.info("Inicialização interna do LiveTrader concluída.")
+
+        try:
             # Verifica se o provider foi criado e está conectado
             if self.trader_engine and self.trader_engine.mt5_provider and self.trader_engine.mt5_provider.is_connected():
                  # Verifica se algum ativo foi carregado com sucesso
@@ -146,36 +226,29 @@ class LiveTraderDashboard(tk.Tk):
 
                  if successful_assets:
                       self.is_trader_initialized = True
-                      log.info(f"Thread _initialize_trader_engine: LiveTrader inicializado com sucesso para {len(successful_assets)} ativo(s).")
+                      log.info("LiveTrader inicializado com sucesso para %d ativo(s).", len(successful_assets))
                       # A própria thread do LiveTrader já envia status "Iniciado" e "Pronto"
                  else:
                       self.is_trader_initialized = False # Considera falha se nenhum ativo carregou
-                      log.error("Thread _initialize_trader_engine: LiveTrader inicializado, mas nenhum ativo foi carregado com sucesso.")
-                      self.queue.put({"type": "status", "asset": "GLOBAL", "message": "Erro Carga Ativos", "color": "red"})
+                      log.error("LiveTrader inicializado, mas nenhum ativo foi carregado com sucesso.")
+                      self.queue_put({"type": "status", "asset": "GLOBAL", "message": "Erro Carga Ativos", "color": "red"})
 
             else:
                  self.is_trader_initialized = False
-                 log.error("Thread _initialize_trader_engine: LiveTrader falhou na inicialização (provavelmente erro na conexão MT5).")
+                 log.error("LiveTrader falhou na inicialização (provavelmente erro na conexão MT5).")
                  # A própria thread do LiveTrader já deve ter enviado o erro "Erro MT5"
-                 # self.queue.put({"type": "status", "asset": "GLOBAL", "message": "Live Erro MT5", "color": "red"})
 
         except Exception as e:
-            log.critical(f"Falha crítica ao instanciar ou aguardar LiveTrader: {e}", exc_info=True)
+            log.critical("Falha crítica ao verificar inicialização do LiveTrader: %s", e, exc_info=True)
             self.is_trader_initialized = False
-            # Garante que uma mensagem de erro seja enviada para a GUI
-            try:
-                self.queue.put({"type": "status", "asset": "GLOBAL", "message": "Live CRÍTICO", "color": "red"})
-            except Exception as qe:
-                log.error(f"Erro ao enviar status CRÍTICO para a fila: {qe}")
-        finally:
-            log.info("Thread _initialize_trader_engine: Finalizada.")
+            self.queue_put({"type": "status", "asset": "GLOBAL", "message": "Live CRÍTICO", "color": "red"})
 
 
     def _initialize_simulation_engine(self):
         """(Thread) Instancia o SimulationEngine."""
         log.info("Thread _initialize_simulation_engine: Iniciando...")
         try:
-            self.simulation_engine = SimulationEngine(config_path=self.config_path)
+            self.simulation_engine = SimulationEngine(config_path=self.config_path, config=self.config)
             # Tenta carregar recursos para verificar se está funcional
             # Pega o primeiro ativo da lista geral (mesmo que não habilitado para live)
             first_asset_cfg = next(iter(self.config.get('assets', [])), None)
@@ -183,11 +256,11 @@ class LiveTraderDashboard(tk.Tk):
                  self.simulation_engine._load_asset_resources(first_asset_cfg['ticker']) # Pré-carrega um
             self.is_simulation_engine_initialized = True
             log.info("Thread _initialize_simulation_engine: SimulationEngine instanciado.")
-            self.queue.put({"type": "status_sim", "message": "Simulador Pronto", "color": "blue"})
+            self.queue_put({"type": "status_sim", "message": "Simulador Pronto", "color": "blue"})
         except Exception as e:
-            log.critical(f"Falha crítica ao instanciar SimulationEngine: {e}", exc_info=True)
+            log.critical("Falha crítica ao instanciar SimulationEngine: %s", e, exc_info=True)
             self.is_simulation_engine_initialized = False
-            self.queue.put({"type": "status_sim", "message": "Erro Simulador", "color": "red"})
+            self.queue_put({"type": "status_sim", "message": "Erro Simulador", "color": "red"})
         log.info("Thread _initialize_simulation_engine: Finalizada.")
 
 
@@ -220,9 +293,9 @@ class LiveTraderDashboard(tk.Tk):
         self.sim_tf_combo.pack(side=tk.LEFT, padx=5)
 
         # Data/Hora
-        default_time_str = (datetime.now(self.local_tz) - timedelta(minutes=15)).strftime("%Y-%m-%d %H:%M:00") # Pega 15min atrás
         ttk.Label(header_frame, text="Data/Hora (Local):").pack(side=tk.LEFT, padx=5)
-        self.sim_datetime_var = tk.StringVar(value=default_time_str)
+        # Padrão: 15 min atrás, no fuso local (constantes de módulo, sem lookup pytz)
+        self.sim_datetime_var = tk.StringVar(value=(datetime.now(UTC_TZ).astimezone(LOCAL_TZ) - timedelta(minutes=15)).strftime("%Y-%m-%d %H:%M:00"))
         self.sim_datetime_entry = ttk.Entry(header_frame, textvariable=self.sim_datetime_var, width=20)
         self.sim_datetime_entry.pack(side=tk.LEFT, padx=5)
 
@@ -245,7 +318,7 @@ class LiveTraderDashboard(tk.Tk):
         scrollbar = ttk.Scrollbar(assets_canvas_frame, orient="vertical", command=canvas.yview)
 
         self.scrollable_frame = ttk.Frame(canvas, style="TFrame")
-        self.scrollable_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
+        self.scrollable_frame.bind("<Configure>", partial(self._on_canvas_configure, canvas))
 
         canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw", width=1300) # Define largura inicial
         canvas.configure(yscrollcommand=scrollbar.set)
@@ -274,19 +347,20 @@ class LiveTraderDashboard(tk.Tk):
              # Mostra mensagem se nenhum ativo live estiver configurado
              ttk.Label(self.scrollable_frame, text="Nenhum ativo habilitado para Live Trading.",
                        style="Header.TLabel", foreground="orange").pack(pady=20)
+        # scrollregion calculado uma vez após criar todos os cards
+        self.scrollable_frame.update_idletasks()
+        canvas.configure(scrollregion=(0, 0, 1300, self.scrollable_frame.winfo_reqheight()))
+
+
+    def _on_canvas_configure(self, canvas, event):
+        """Ajusta o scrollregion a partir das dimensões do evento (O(1)), sem bbox("all") varrendo o canvas."""
+        canvas.configure(scrollregion=(0, 0, event.width, event.height))
 
 
     def _create_asset_widgets(self, parent):
         """Cria um 'card' para cada ativo LIVE monitorado."""
         num_columns = 3
         
-        # Usa self.assets (já filtrado para live)
-        asset_configs_live = {
-             asset_cfg['ticker']: asset_cfg 
-             for asset_cfg in self.config.get('assets', []) 
-             if asset_cfg.get('ticker') in self.assets
-        }
-
         for i, asset_symbol in enumerate(self.assets):
             row = i // num_columns
             col = i % num_columns
@@ -297,7 +371,7 @@ class LiveTraderDashboard(tk.Tk):
 
             card.columnconfigure(1, weight=1)
 
-            widgets = {}
+            widgets = {"_last": {}} # "_last": último (texto, estilo) exibido por campo
 
             # Linha 1: Título e Status
             widgets["title"] = ttk.Label(card, text=asset_symbol, style="Header.TLabel")
@@ -306,9 +380,7 @@ class LiveTraderDashboard(tk.Tk):
             widgets["status"].grid(row=0, column=2, sticky="e")
 
             # Linha 2: Timeframe e Posição
-            asset_cfg = asset_configs_live.get(asset_symbol, {})
-            live_config = asset_cfg.get('live_trading', {})
-            tf = live_config.get('timeframe_str', 'N/A')
+            tf = self._asset_meta[asset_symbol]['tf']
             widgets["tf"] = ttk.Label(card, text=f"TF: {tf}")
             widgets["tf"].grid(row=1, column=0, sticky="w")
             widgets["position"] = ttk.Label(card, text="POSIÇÃO: ---", style="PositionFlat.TLabel", anchor=tk.E)
@@ -389,28 +461,40 @@ class LiveTraderDashboard(tk.Tk):
              messagebox.showwarning("Atenção", "Selecione um ativo para simular.")
              return
 
-        try:
-            dt_local = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M:%S")
-            dt_local_aware = self.local_tz.localize(dt_local)
-        except Exception as e:
-            messagebox.showerror("Erro de Formato", f"Data/Hora inválida: {e}\nUse YYYY-MM-DD HH:MM:SS")
-            return
-
-        log.info(f"Executando simulação para {asset} @ {tf} em {dt_local_aware}")
+        if datetime_str == self._last_dt_parse[0]: # Mesmo texto do clique anterior: reutiliza o parse
+            dt_local_aware = self._last_dt_parse[1]
+        else:
+            try:
+                dt_local = datetime.strptime(datetime_str, _DT_FMT)
+                dt_local_aware = dt_local.replace(tzinfo=LOCAL_TZ) if _USE_ZONEINFO else LOCAL_TZ.localize(dt_local)
+            except Exception as e:
+                messagebox.showerror("Erro de Formato", f"Data/Hora inválida: {e}\nUse YYYY-MM-DD HH:MM:SS")
+                return
+            self._last_dt_parse = (datetime_str, dt_local_aware)
+
+        log.info("Executando simulação para %s @ %s em %s", asset, tf, dt_local_aware)
         self.sim_status_label.config(text="Simulando...", foreground=self.hold_color)
         self.sim_button.config(state=tk.DISABLED) # Desabilita botão durante simulação
 
-        # Executa a simulação em uma thread separada para não travar a GUI
-        Thread(target=self._execute_simulation_thread, args=(asset, tf, dt_local_aware), daemon=True).start()
+        # Enfileira para o worker de simulação (não trava a GUI)
+        self._sim_jobs.put((asset, tf, dt_local_aware))
+
+    def _simulation_worker(self):
+        """(Thread) Executa as simulações enfileiradas até receber o sentinela None."""
+        while True:
+            job = self._sim_jobs.get()
+            if job is None: break
+            self._execute_simulation_thread(*job)
+        log.info("Worker de simulação finalizado.")
 
     def _execute_simulation_thread(self, asset, tf, dt_local_aware):
         """(Thread) Executa a simulação e envia resultado para a fila."""
         try:
             result = self.simulation_engine.run_simulation_cycle(asset, tf, dt_local_aware)
-            self.queue.put({"type": "sim_result", "data": result})
+            self.queue_put({"type": "sim_result", "data": result})
         except Exception as e:
-            log.error(f"Erro ao executar simulação na thread: {e}", exc_info=True)
-            self.queue.put({"type": "sim_result", "data": {"error": f"Erro interno: {e}"}})
+            log.error("Erro ao executar simulação na thread: %s", e, exc_info=True)
+            self.queue_put({"type": "sim_result", "data": {"error": f"Erro interno: {e}"}})
 
 
     def _show_simulation_result(self, result):
@@ -426,120 +510,148 @@ class LiveTraderDashboard(tk.Tk):
 
         self.sim_status_label.config(text="Simulação Concluída", foreground=self.buy_color)
 
-        win = tk.Toplevel(self)
-        win.title(f"Resultado Simulação: {result.get('asset')} @ {result.get('datetime')}")
-        win.configure(bg=self.bg_color)
-        win.geometry("600x600") # Tamanho da janela
-
-        # Frame principal com scrollbar
-        main_sim_frame = ttk.Frame(win)
-        main_sim_frame.pack(fill=tk.BOTH, expand=True)
-        sim_canvas = tk.Canvas(main_sim_frame, bg=self.bg_color, highlightthickness=0)
-        sim_scrollbar = ttk.Scrollbar(main_sim_frame, orient="vertical", command=sim_canvas.yview)
-        sim_scrollable_frame = ttk.Frame(sim_canvas, style="TFrame", padding=15)
-
-        sim_scrollable_frame.bind("<Configure>", lambda e: sim_canvas.configure(scrollregion=sim_canvas.bbox("all")))
-        sim_canvas.create_window((0, 0), window=sim_scrollable_frame, anchor="nw")
-        sim_canvas.configure(yscrollcommand=sim_scrollbar.set)
-
-        sim_canvas.pack(side="left", fill="both", expand=True)
-        sim_scrollbar.pack(side="right", fill="y")
-
-        # --- Conteúdo da Janela ---
-        row = 0
-        bold_font = tkFont.Font(font=("Segoe UI", 10, "bold"))
+        self._ensure_sim_popup()
+        tree = self._sim_tree
+        tree.delete(*tree.get_children())
 
         # Exibe os resultados principais
         main_results = {k: v for k, v in result.items() if k not in ["indicators", "setup_details"]}
+        price_fmt = self._asset_meta.get(result.get('asset'), {}).get('price_fmt', "{:.2f}".format)
         for key, value in main_results.items():
-            ttk.Label(sim_scrollable_frame, text=f"{key.replace('_', ' ').title()}:", font=bold_font).grid(row=row, column=0, sticky="ne", padx=5, pady=3)
             # Formata floats com precisão definida
-            display_value = f"{value:.{self.asset_resources.get(result.get('asset'), {}).get('price_precision', 2)}f}" if isinstance(value, float) else str(value)
-            
-            lbl = ttk.Label(sim_scrollable_frame, text=display_value, wraplength=350, anchor="w")
-            lbl.grid(row=row, column=1, sticky="nw", padx=5, pady=3)
-            
+            display_value = price_fmt(value) if isinstance(value, float) else str(value)
             # Colore sinais
             if key in ["ai_signal", "final_signal"]:
-                 self._update_label_color(lbl, value)
+                 tags = (self._SIGNAL_TAGS.get(value, "hold"),)
             elif key == "setup_is_valid":
-                 lbl.config(foreground=self.buy_color if value else self.sell_color)
+                 tags = ("buy" if value else "sell",)
+            else:
+                 tags = ()
+            tree.insert("", "end", values=(f"{key.replace('_', ' ').title()}:", display_value), tags=tags)
+
+        # Exibe Detalhes do Setup e Indicadores (uma linha por item)
+        for section, items in (("Detalhes Setup:", result.get("setup_details", {})), ("Indicadores:", result.get("indicators", {}))):
+            tree.insert("", "end", values=(section, "" if items else "N/A"), tags=("section",))
+            for k, v in (items or {}).items():
+                tree.insert("", "end", values=("", f"- {k}: {v}"))
+
+        self._sim_popup.title(f"Resultado Simulação: {result.get('asset')} @ {result.get('datetime')}")
+        self._sim_popup.deiconify()
+        self._sim_popup.lift()
+
+    def _ensure_sim_popup(self):
+        """Cria (uma única vez) o popup de resultado com um Treeview chave/valor; fechar apenas o oculta."""
+        if self._sim_popup is not None: return
+        win = tk.Toplevel(self)
+        win.configure(bg=self.bg_color)
+        win.geometry("600x600") # Tamanho da janela
+        win.protocol("WM_DELETE_WINDOW", win.withdraw)
+
+        frame = ttk.Frame(win, padding=15)
+        frame.pack(fill=tk.BOTH, expand=True)
+        tree = ttk.Treeview(frame, columns=("key", "value"), show="headings")
+        tree.heading("key", text="Campo"); tree.heading("value", text="Valor")
+        tree.column("key", width=160, anchor="e", stretch=False)
+        tree.column("value", width=380, anchor="w")
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+        tree.tag_configure("buy", foreground=self.buy_color)
+        tree.tag_configure("sell", foreground=self.sell_color)
+        tree.tag_configure("hold", foreground=self.hold_color)
+        tree.tag_configure("section", font=("Segoe UI", 10, "bold"))
+        self._sim_popup, self._sim_tree = win, tree
 
-            row += 1
 
-        # Exibe Detalhes do Setup
-        ttk.Label(sim_scrollable_frame, text="Detalhes Setup:", font=bold_font).grid(row=row, column=0, sticky="ne", padx=5, pady=5)
-        setup_details = result.get("setup_details", {})
-        setup_details_str = "\n".join([f"- {k}: {v}" for k, v in setup_details.items()]) if setup_details else "N/A"
-        ttk.Label(sim_scrollable_frame, text=setup_details_str, wraplength=350, anchor="w").grid(row=row, column=1, sticky="nw", padx=5, pady=5)
-        row += 1
+    def queue_put(self, msg):
+        """(Qualquer thread) Enfileira mensagem para a GUI; só ticks vão para o canal limitado."""
+        (self._deque if msg.get("type") in self._LOSSY_MSG_TYPES else self._ctrl_deque).append(msg)
 
-        # Exibe Indicadores
-        ttk.Label(sim_scrollable_frame, text="Indicadores:", font=bold_font).grid(row=row, column=0, sticky="ne", padx=5, pady=5)
-        indicators = result.get("indicators", {})
-        indicators_str = "\n".join([f"- {k}: {v}" for k, v in indicators.items()]) if indicators else "N/A"
-        ttk.Label(sim_scrollable_frame, text=indicators_str, wraplength=350, anchor="w").grid(row=row, column=1, sticky="nw", padx=5, pady=5)
-        row += 1
+    def _process_queue(self):
+        """Processa eventos da fila em lote.
+
+        Drena a fila inteira e coalesce mensagens por (tipo, ativo): várias "update"/"position"/
+        "status" do mesmo ativo no mesmo tick viram uma só (a última) antes de qualquer widget.config.
+        """
+        pending = {} # (tipo, ativo) -> última mensagem (ordem da primeira chegada preservada)
+        events = [] # Eventos não coalescidos (sim_result abre um popup cada; init_done é único por motor)
+        messages_seen = 0
+        for channel in (self._ctrl_deque, self._deque): # Drena todas as mensagens (controle primeiro)
+            while channel:
+                msg = channel.popleft()
+                messages_seen += 1
+                if msg["type"] in ("sim_result", "init_done"): events.append(msg)
+                else: pending[(msg["type"], msg.get("asset"))] = msg
+
+        for (msg_type, asset), msg in pending.items():
+            try:
+                if msg_type == "update":
+                    self._update_asset_card(asset, msg)
+                elif msg_type == "position":
+                    self._update_asset_position(asset, msg)
+                elif msg_type == "status":
+                    self._update_status_label(asset, msg.get("message", "??"), msg.get("color", "grey"))
+                elif msg_type == "status_sim":
+                    self.sim_status_label.config(text=msg.get("message", "??"), foreground=self._color_by_name.get(msg.get("color", "grey"), self.fg_color))
+            except Exception as e:
+                self._log_queue_error(e)
+        for msg in events:
+            try:
+                if msg["type"] == "sim_result": # Resultado da simulação chegou
+                    self._show_simulation_result(msg.get("data"))
+                else:
+                    log.info("Inicialização do motor '%s' concluída (ok=%s).", msg.get('which'), msg.get('ok'))
+                    if msg.get("which") == "trader" and msg.get("ok"):
+                        self.after(200, self._check_trader_ready) # Acompanha a init interna do LiveTrader
+            except Exception as e: self._log_queue_error(e)
 
-        # Ajusta largura da coluna de labels
-        sim_scrollable_frame.columnconfigure(0, minsize=120)
-        sim_scrollable_frame.columnconfigure(1, weight=1)
+        # Poll adaptativo: ~30 Hz enquanto há tráfego; quando ocioso, dobra o intervalo até 200 ms
+        delay = 33 if messages_seen else min(200, self._idle_delay * 2)
+        self._idle_delay = delay
+        self.after(delay, self._process_queue) # Reagenda
 
 
-    def _process_queue(self):
-        """Processa eventos da fila."""
-        try:
-            while True: # Processa todas as mensagens na fila
-                msg = self.queue.get_nowait()
-
-                if msg["type"] == "update":
-                    self._update_asset_card(msg.get("asset"), msg)
-                elif msg["type"] == "position":
-                    self._update_asset_position(msg.get("asset"), msg)
-                elif msg["type"] == "status":
-                    self._update_status_label(msg.get("asset"), msg.get("message", "??"), msg.get("color", "grey"))
-                elif msg["type"] == "status_sim":
-                    self.sim_status_label.config(text=msg.get("message", "??"), foreground=self.style.lookup(f"{msg.get('color', 'grey').title()}.TLabel", "foreground", default=self.fg_color))
-                elif msg["type"] == "sim_result": # Resultado da simulação chegou
-                     self._show_simulation_result(msg.get("data"))
-
-        except Empty:
-            pass # Fila vazia
-        except Exception as e:
-            log.warning(f"Erro ao processar fila da GUI: {e}", exc_info=True)
-        finally:
-            self.after(100, self._process_queue) # Reagenda
+    def _log_queue_error(self, error):
+        """Loga erro da fila da GUI; traceback só em DEBUG (evita formatá-lo no poll da GUI)."""
+        log.warning("Erro fila GUI: %s", error)
+        if log.isEnabledFor(logging.DEBUG): log.debug("traceback", exc_info=True)
 
 
     def _update_asset_card(self, asset_symbol, data):
-        """Atualiza um card de ativo."""
+        """Atualiza um card de ativo.
+
+        Cada widget recebe no máximo um .configure (texto e estilo juntos) e só quando o valor
+        difere do último exibido — em mercado parado a maioria dos ticks não toca nenhum widget.
+        """
         if not asset_symbol or asset_symbol not in self.asset_widgets: return
         widgets = self.asset_widgets[asset_symbol]
 
         price = data.get('price', 'N/A')
-        precision = self.asset_resources.get(asset_symbol, {}).get('price_precision', 2)
-        price_str = f"{price:.{precision}f}" if isinstance(price, (float, int)) else str(price)
-
-        widgets["price"].config(text=price_str)
-        widgets["datetime"].config(text=f"Atualizado: {data.get('datetime', '---')}")
+        fmt = self._asset_meta[asset_symbol]['price_fmt']
+        price_str = fmt(price) if isinstance(price, (float, int)) else str(price)
 
         ai_signal = data.get("ai_signal", "N/A")
-        widgets["ai_signal"].config(text=ai_signal)
-        self._update_label_color(widgets["ai_signal"], ai_signal)
-
         setup_valid = data.get("setup_valid", None)
-        widgets["setup_valid"].config(text=("SIM" if setup_valid else "NÃO") if isinstance(setup_valid, bool) else "N/A")
-        widgets["setup_valid"].config(style="Buy.TLabel" if setup_valid else "Sell.TLabel" if setup_valid is False else "Hold.TLabel")
-
         final_signal = data.get("final_signal", "N/A")
-        widgets["final_signal"].config(text=final_signal)
-        self._update_label_color(widgets["final_signal"], final_signal)
 
-
-    def _update_label_color(self, label_widget, text_value):
-        """Muda o estilo do label baseado no texto."""
-        style_map = {"COMPRA": "Buy.TLabel", "VENDA": "Sell.TLabel"}
-        label_widget.config(style=style_map.get(text_value, "Hold.TLabel"))
+        # campo -> (texto, estilo); estilo None = widget sem troca de estilo
+        new_values = {
+            "price": (price_str, None),
+            "datetime": (f"Atualizado: {data.get('datetime', '---')}", None),
+            "ai_signal": (ai_signal, self._SIGNAL_STYLES.get(ai_signal, "Hold.TLabel")),
+            "setup_valid": (("SIM" if setup_valid else "NÃO") if isinstance(setup_valid, bool) else "N/A",
+                            "Buy.TLabel" if setup_valid else "Sell.TLabel" if setup_valid is False else "Hold.TLabel"),
+            "final_signal": (final_signal, self._SIGNAL_STYLES.get(final_signal, "Hold.TLabel")),
+        }
+        last = widgets["_last"]
+        for field, value in new_values.items():
+            if last.get(field) != value:
+                text, style = value
+                if style is None: widgets[field].configure(text=text)
+                else: widgets[field].configure(text=text, style=style)
+                last[field] = value
 
 
     def _update_asset_position(self, asset_symbol, data):
@@ -548,8 +660,8 @@ class LiveTraderDashboard(tk.Tk):
         widgets = self.asset_widgets[asset_symbol]
         status = data.get("status", "---")
         price = data.get("price", "N/A")
-        precision = self.asset_resources.get(asset_symbol, {}).get('price_precision', 2)
-        price_str = f"{price:.{precision}f}" if isinstance(price, (float, int)) else str(price)
+        fmt = self._asset_meta[asset_symbol]['price_fmt']
+        price_str = fmt(price) if isinstance(price, (float, int)) else str(price)
 
         if status == "Comprado":
             widgets["position"].config(text=f"COMPRADO @ {price_str}", style="PositionBuy.TLabel")
@@ -561,9 +673,7 @@ class LiveTraderDashboard(tk.Tk):
 
     def _update_status_label(self, asset_symbol, message, color_name):
         """Atualiza labels de status."""
-        color_map = { "red": self.sell_color, "green": self.buy_color, "blue": self.status_ok_color,
-                      "orange": self.hold_color, "grey": self.fg_color }
-        color = color_map.get(color_name, self.fg_color)
+        color = self._color_by_name.get(color_name, self.fg_color)
 
         if asset_symbol == "GLOBAL":
             self.global_status_label.config(text=message or "??", foreground=color)
@@ -585,6 +695,10 @@ class LiveTraderDashboard(tk.Tk):
                  log.info("Sinalizando parada para thread de inicialização do LiveTrader...")
                  if hasattr(self.trader_engine, '_stop_event'): self.trader_engine._stop_event.set()
 
+            # Encerra o worker de simulação e libera o pool de init
+            self._sim_jobs.put(None)
+            self._init_pool.shutdown(wait=False)
+
             # Fecha engine de simulação
             if self.simulation_engine and hasattr(self.simulation_engine, 'close'):
                  log.info("Fechando SimulationEngine...")
@@ -10,8 +10,10 @@ e exibe alertas/logs em tempo real de forma thread-safe.
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 import threading
-import queue
 import logging
+import time
+import numpy as np
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 import sys
@@ -29,6 +31,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Formatação de preço em BRL (troca ',' <-> '.' em uma única passada)
+_BRL_TRANS = str.maketrans({',': '.', '.': ','})
+
 
 class MonitorApp:
     """
@@ -44,6 +49,17 @@ class MonitorApp:
     - Comunicação thread-safe entre monitor e UI via Queue
     """
     
+    # Máximo de eventos drenados da queue por ciclo de polling
+    _MAX_BATCH = 200
+    # Máximo de linhas mantidas em cada grid
+    _MAX_ROWS = 1000
+    # Formato de data/hora dos grids (UTC)
+    _STRFTIME_LOG = '%d/%m/%Y %H:%M:%S'
+    # Intervalo mínimo entre atualizações do header (10 Hz)
+    _HEADER_INTERVAL_S = 0.1
+    # Interpretador Tcl cujos estilos já foram configurados (evita reconfigurar)
+    _styles_interp = None
+    
     def __init__(self, root, mode='live', replay_config=None):
         """
         Inicializa a aplicação GUI.
@@ -81,8 +97,41 @@ class MonitorApp:
             'volume': 0
         }
         
-        # Queue para comunicação thread-safe
-        self.update_queue = queue.Queue()
+        # Queue para comunicação thread-safe: deque limitado (append/popleft são
+        # atômicos no CPython para um produtor/um consumidor, sem lock por evento).
+        # Só as linhas de log/tick ('update') podem ser descartadas sob rajada;
+        # eventos de controle ('stopped', 'error') vão para um deque sem limite
+        self.update_queue = deque(maxlen=4096)
+        self._control_queue = deque()
+        # Drenagem agendada via after_idle pelo produtor (evita agendar várias)
+        self._drain_scheduled = False
+        
+        # Contadores de linhas dos grids (evita get_children() a cada evento)
+        self._logs_count = 0
+        self._analysis_count = 0
+        
+        # Formatador de preço cacheado (R$ 1.234,56)
+        self._fmt_price = lambda p: f"R$ {p:,.2f}".translate(_BRL_TRANS)
+        
+        # Tuplas de tags compartilhadas entre inserts (uma por tipo de evento)
+        self._tag_tuples = {t: (t,) for t in ('ALERT', 'INFO', 'TICK')}
+        # Template do OHLC do header (método format pré-vinculado)
+        self._ohlc_tmpl = "O: {:.2f} | H: {:.2f} | L: {:.2f} | C: {:.2f}".format
+        # Tags já configuradas no grid ML (tipos novos recebem estilo padrão uma vez)
+        self._known_tags = {'ALERT', 'INFO', 'TICK'}
+        
+        # Header do último candle: guarda o último evento e redesenha no máximo a 10 Hz
+        self._pending_header = None
+        self._header_dirty = False
+        self._header_last_flush = 0.0
+        
+        # Grid de análise: só recebe inserts quando a tab está visível;
+        # enquanto oculto, as linhas ficam no backlog (últimas 1000)
+        self.analysis_grid_visible = False
+        self._analysis_backlog = deque(maxlen=self._MAX_ROWS)
+        
+        # Auto-scroll do grid ML é suspenso por 2s após o usuário rolar
+        self._user_scrolled_until = 0.0
         
         # Janela de buffer (inicialmente None)
         self.buffer_window = None
@@ -96,14 +145,18 @@ class MonitorApp:
         # Constrói interface
         self._build_ui()
         
-        # Inicia polling da queue
+        # Inicia heartbeat da queue (drenagem normal é via after_idle)
         self._poll_queue()
         
         logger.info(f"Interface GUI inicializada em modo {mode.upper()}")
     
     def _setup_styles(self):
-        """Configura estilos visuais do ttk."""
-        style = ttk.Style()
+        """Configura estilos visuais do ttk (uma vez por interpretador Tcl)."""
+        if MonitorApp._styles_interp is self.root.tk:
+            return
+        MonitorApp._styles_interp = self.root.tk
+        
+        style = ttk.Style(self.root)
         style.theme_use('clam')  # Tema moderno
         
         # Estilo para botão Start
@@ -341,12 +394,14 @@ class MonitorApp:
         # Notebook com 2 tabs
         notebook = ttk.Notebook(logs_frame)
         notebook.pack(fill=tk.BOTH, expand=True)
+        self.logs_notebook = notebook
         
         # Tab 1: Sinais ML
         self._build_ml_signals_tab(notebook)
         
         # Tab 2: Análise Técnica
         self._build_technical_tab(notebook)
+        notebook.bind('<<NotebookTabChanged>>', self._toggle_analysis_grid)
         
         # Adiciona ao PanedWindow
         parent.add(logs_frame, weight=1)
@@ -396,18 +451,35 @@ class MonitorApp:
         self.logs_tree.column('probability', width=100, anchor=tk.E)
         self.logs_tree.column('message', width=500, anchor=tk.W)
         
+        # Rolagem manual suspende o auto-scroll temporariamente
+        for seq in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.logs_tree.bind(seq, self._on_user_scroll, add='+')
+        
         # Tags
         self.logs_tree.tag_configure('ALERT', background='#fff3cd', foreground='#856404')
         self.logs_tree.tag_configure('INFO', background='#d1ecf1', foreground='#0c5460')
         self.logs_tree.tag_configure('TICK', background='#ffffff', foreground='#6c757d')
     
+    def _on_user_scroll(self, event=None):
+        """Marca rolagem manual no grid ML (suspende auto-scroll por 2s)."""
+        self._user_scrolled_until = time.monotonic() + 2.0
+    
     def _build_technical_tab(self, notebook):
-        """Constrói tab de análise técnica."""
+        """
+        Constrói tab de análise técnica.
+        
+        Apenas a tab é criada aqui; o Treeview é construído sob demanda na
+        primeira vez que a tab é exibida (_build_analysis_tree).
+        """
         tab = ttk.Frame(notebook)
         notebook.add(tab, text="Análise Técnica")
-        
+        self._analysis_tab = tab
+        self.analysis_tree = None
+    
+    def _build_analysis_tree(self):
+        """Constrói o Treeview de análise técnica dentro da tab."""
         # Container com scrollbars
-        container = ttk.Frame(tab)
+        container = ttk.Frame(self._analysis_tab)
         container.pack(fill=tk.BOTH, expand=True)
         container.columnconfigure(0, weight=1)
         container.rowconfigure(0, weight=1)
@@ -453,9 +525,31 @@ class MonitorApp:
         self.analysis_tree.tag_configure('INFO', background='#d1ecf1')
         self.analysis_tree.tag_configure('TICK', background='#ffffff')
     
-    def _toggle_analysis_grid(self):
-        """Método obsoleto - mantido para compatibilidade."""
-        pass
+    def _toggle_analysis_grid(self, event=None):
+        """
+        Atualiza a visibilidade do grid de análise conforme a tab selecionada.
+        
+        Ao tornar-se visível, descarrega o backlog acumulado em um único loop.
+        """
+        self.analysis_grid_visible = self.logs_notebook.select() == str(self._analysis_tab)
+        if not self.analysis_grid_visible:
+            return
+        
+        if self.analysis_tree is None:
+            self._build_analysis_tree()
+        if not self._analysis_backlog:
+            return
+        
+        # Backlog está em ordem de chegada: inserir no topo deixa o mais recente primeiro
+        insert = self.analysis_tree.insert
+        for values, tags in self._analysis_backlog:
+            insert('', 0, values=values, tags=tags)
+        self._analysis_count += len(self._analysis_backlog)
+        self._analysis_backlog.clear()
+        
+        if self._analysis_count > self._MAX_ROWS:
+            self.analysis_tree.delete(*self.analysis_tree.get_children()[self._MAX_ROWS:])
+            self._analysis_count = self._MAX_ROWS
     
     def _toggle_monitor(self):
         """
@@ -550,12 +644,12 @@ class MonitorApp:
             self.monitor.start()
         except Exception as e:
             logger.error(f"Erro no monitor: {e}", exc_info=True)
-            self.update_queue.put({
+            self._enqueue({
                 'action': 'error',
                 'message': str(e)
             })
         finally:
-            self.update_queue.put({'action': 'stopped'})
+            self._enqueue({'action': 'stopped'})
     
     def _stop_monitor(self):
         """Para o monitor."""
@@ -565,9 +659,11 @@ class MonitorApp:
             if self.monitor:
                 self.monitor.stop()
             
-            # Aguarda thread finalizar (com timeout)
+            # Aguarda thread finalizar sem bloquear o Tk (watchdog via after, até 5s)
             if self.monitor_thread and self.monitor_thread.is_alive():
-                self.monitor_thread.join(timeout=5)
+                self.start_stop_btn.config(text="… Parando", state='disabled')
+                self.root.after(100, self._check_stopped, 1)
+                return
             
             self._reset_ui_state()
             
@@ -577,12 +673,25 @@ class MonitorApp:
             logger.error(f"Erro ao parar monitor: {e}", exc_info=True)
             messagebox.showerror("Erro", f"Falha ao parar monitor:\n{str(e)}")
     
+    def _check_stopped(self, attempt: int):
+        """Watchdog de parada: verifica a thread do monitor a cada 100ms (máx. 50 vezes)."""
+        if self.monitor_thread and self.monitor_thread.is_alive():
+            if attempt < 50:
+                self.root.after(100, self._check_stopped, attempt + 1)
+                return
+            logger.warning("Thread do monitor não finalizou em 5s")
+        else:
+            logger.info("Monitor parado com sucesso")
+        
+        self._reset_ui_state()
+    
     def _reset_ui_state(self):
         """Reseta estado da UI para parado."""
         self.is_running = False
         self.start_stop_btn.config(
             text="▶ Iniciar",
-            style='Start.TButton'
+            style='Start.TButton',
+            state='normal'
         )
         # Atualiza semáforo para vermelho
         self.status_canvas.itemconfig(self.status_indicator, fill='#dc3545')
@@ -591,168 +700,281 @@ class MonitorApp:
         """
         Callback chamado pelo monitor quando há nova atualização.
         
-        Adiciona dados à queue para processamento thread-safe.
+        Roda na thread do monitor: toda a formatação das linhas dos grids e do
+        header é feita aqui, e a thread do Tk só insere os valores prontos.
+        O evento enfileirado sempre traz data['timestamp'] como datetime.
         
         Args:
             data: Dicionário com dados do evento (type, timestamp, price, etc.)
         """
-        self.update_queue.put({
+        try:
+            event = self._format_update(data)
+        except Exception as e:
+            logger.error("Erro ao formatar atualização: %s", e)
+            return
+        
+        self._enqueue(event)
+    
+    def _enqueue(self, event: dict):
+        """
+        Enfileira um evento e agenda a drenagem para o próximo idle do Tk.
+        
+        Chamado pelas threads do monitor; o heartbeat de _poll_queue cobre o
+        caso de o agendamento falhar.
+        """
+        if event['action'] == 'update':
+            self.update_queue.append(event)
+        else:
+            self._control_queue.append(event)
+        if self._drain_scheduled:
+            return
+        self._drain_scheduled = True
+        try:
+            self.root.after_idle(self._drain_queue)
+        except RuntimeError:
+            # Tk sem suporte a chamadas de outra thread / encerrando: fica com o heartbeat
+            self._drain_scheduled = False
+    
+    def _format_update(self, data: dict) -> dict:
+        """
+        Monta o evento de atualização com as linhas já formatadas.
+        
+        Args:
+            data: Dicionário com dados do evento
+            
+        Returns:
+            dict: {action, type, tags, logs_row, analysis_row, header, data}
+        """
+        # Contrato: a partir daqui data['timestamp'] é sempre datetime.
+        # ISO string é convertida aqui (thread do monitor); ausente vira agora
+        timestamp = data.get('timestamp')
+        if not isinstance(timestamp, datetime):
+            timestamp = datetime.fromisoformat(timestamp) if isinstance(timestamp, str) else datetime.now()
+            data = dict(data, timestamp=timestamp)
+        
+        # Formata data/hora para o log (UTC no formato DD/MM/YYYY HH:MM:SS)
+        datetime_str = timestamp.strftime(self._STRFTIME_LOG)
+        
+        # Formata tipo (internado: repete em milhares de linhas)
+        event_type = sys.intern(str(data.get('type', 'TICK')))
+        tags = self._tag_tuples.get(event_type)
+        if tags is None:
+            tags = self._tag_tuples.setdefault(event_type, (event_type,))
+        
+        # Formata preço
+        price = data.get('close', data.get('price', 0.0))
+        price_str = self._fmt_price(price)
+        
+        # Formata probabilidade
+        probability = data.get('probability', 0.0)
+        prob_str = f"{probability:.1f}"
+        
+        # Mensagem
+        message = data.get('message', '')
+        
+        # Formata tendência
+        trend = data.get('trend', 'N/A')
+        trend_strength = data.get('trend_strength', '')
+        if trend_strength and trend != 'N/A':
+            trend_str = f"{trend} ({trend_strength[0]})"
+        else:
+            trend_str = trend
+        trend_str = sys.intern(str(trend_str))
+        
+        # Formata RSI
+        rsi = data.get('rsi', 0.0)
+        rsi_condition = data.get('rsi_condition', '')
+        if rsi > 0:
+            rsi_str = f"{rsi:.0f}"
+            if rsi_condition == 'SOBRECOMPRADO':
+                rsi_str += " 🔺"
+            elif rsi_condition == 'SOBREVENDIDO':
+                rsi_str += " 🔻"
+        else:
+            rsi_str = "N/A"
+        
+        # Formata EMAs/SMAs
+        ema9 = data.get('ema_fast', 0.0)
+        sma20 = data.get('sma_fast', 0.0)
+        sma50 = data.get('sma_slow', 0.0)
+        
+        ema9_str = f"{ema9:.0f}" if ema9 > 0 else "N/A"
+        sma20_str = f"{sma20:.0f}" if sma20 > 0 else "N/A"
+        sma50_str = f"{sma50:.0f}" if sma50 > 0 else "N/A"
+        
+        # Header do último candle (hora UTC + OHLC), só quando o evento traz OHLC
+        header = None
+        if 'open' in data and 'high' in data and 'low' in data and 'close' in data:
+            header = (
+                timestamp.strftime('%H:%M:%S'),
+                self._ohlc_tmpl(data['open'], data['high'], data['low'], data['close'])
+            )
+        
+        return {
             'action': 'update',
+            'type': event_type,
+            'tags': tags,
+            'logs_row': (datetime_str, event_type, price_str, prob_str, message),
+            'analysis_row': (datetime_str, trend_str, rsi_str, ema9_str, sma20_str, sma50_str),
+            'header': header,
             'data': data
-        })
+        }
     
     def _poll_queue(self):
         """
-        Polling da queue de atualizações.
+        Heartbeat da queue de atualizações.
+        
+        A drenagem normal é disparada pelo produtor via after_idle; este
+        polling de 500ms é apenas uma rede de segurança.
+        """
+        try:
+            self._drain_queue()
+        finally:
+            self.root.after(500, self._poll_queue)
+    
+    def _drain_queue(self):
+        """
+        Drena até _MAX_BATCH atualizações e processa em lote (header, trim e
+        auto-scroll uma única vez por lote); em seguida trata todos os eventos
+        de controle pendentes.
         
-        Processa eventos da queue e atualiza UI (thread-safe).
-        Executado periodicamente via root.after.
+        Se ainda sobrarem atualizações, agenda nova drenagem no próximo idle.
         """
+        self._drain_scheduled = False
         try:
-            # Processa todos os eventos pendentes na queue
-            while True:
+            batch = []
+            for _ in range(self._MAX_BATCH):
                 try:
-                    event = self.update_queue.get_nowait()
-                    
-                    if event['action'] == 'update':
-                        self._process_update(event['data'])
-                    elif event['action'] == 'stopped':
-                        self._reset_ui_state()
-                    elif event['action'] == 'error':
-                        messagebox.showerror(
-                            "Erro no Monitor",
-                            f"Erro durante monitoramento:\n{event['message']}"
-                        )
-                        self._reset_ui_state()
-                    
-                except queue.Empty:
+                    batch.append(self.update_queue.popleft())
+                except IndexError:
                     break
+            if batch:
+                self._process_updates_batch(batch)
+            
+            # Eventos de controle depois do lote: 'stopped'/'error' chegam após as últimas linhas
+            while self._control_queue:
+                event = self._control_queue.popleft()
+                if event['action'] == 'stopped':
+                    self._reset_ui_state()
+                elif event['action'] == 'error':
+                    messagebox.showerror(
+                        "Erro no Monitor",
+                        f"Erro durante monitoramento:\n{event['message']}"
+                    )
+                    self._reset_ui_state()
         
         except Exception as e:
             logger.error(f"Erro ao processar queue: {e}", exc_info=True)
         
-        finally:
-            # Reagenda polling (100ms)
-            self.root.after(100, self._poll_queue)
+        if self.update_queue and not self._drain_scheduled:
+            self._drain_scheduled = True
+            self.root.after_idle(self._drain_queue)
     
-    def _process_update(self, data: dict):
+    def _process_updates_batch(self, events: list):
         """
-        Processa atualização do monitor e atualiza UI.
+        Processa um lote de atualizações do monitor.
+        
+        O header é atualizado apenas com o último candle do lote e o trim dos
+        grids é feito uma única vez ao final.
         
         Args:
-            data: Dicionário com dados do evento
+            events: Lista de eventos já formatados (ordem de chegada)
+        """
+        header_event = None
+        for event in events:
+            if event['header'] is not None:
+                header_event = event
+            self._process_update(event)
+        
+        if header_event is not None:
+            self._schedule_header(header_event)
+        
+        # Limita número de linhas dos grids (só consulta o Tk se passou do limite).
+        # Grid ML: sempre visível
+        if self._logs_count > self._MAX_ROWS:
+            self.logs_tree.delete(*self.logs_tree.get_children()[self._MAX_ROWS:])
+            self._logs_count = self._MAX_ROWS
+        # Grid de análise: oculto, o backlog (deque maxlen) já descarta sem tráfego Tcl
+        if self.analysis_grid_visible and self._analysis_count > self._MAX_ROWS:
+            self.analysis_tree.delete(*self.analysis_tree.get_children()[self._MAX_ROWS:])
+            self._analysis_count = self._MAX_ROWS
+        
+        # Auto-scroll para o topo (mostra evento mais recente), salvo se o usuário está rolando
+        if time.monotonic() >= self._user_scrolled_until:
+            self.logs_tree.yview_moveto(0.0)
+        
+        self.root.update_idletasks()
+    
+    def _schedule_header(self, event: dict):
+        """Agenda a atualização do header (coalesce eventos a no máximo 10 Hz)."""
+        self._pending_header = event
+        if self._header_dirty:
+            return
+        self._header_dirty = True
+        
+        wait = self._HEADER_INTERVAL_S - (time.monotonic() - self._header_last_flush)
+        if wait <= 0:
+            self.root.after_idle(self._flush_header)
+        else:
+            self.root.after(int(wait * 1000) + 1, self._flush_header)
+    
+    def _flush_header(self):
+        """Aplica o último header pendente."""
+        self._header_dirty = False
+        self._header_last_flush = time.monotonic()
+        event, self._pending_header = self._pending_header, None
+        if event is not None:
+            self._update_header(event)
+    
+    def _update_header(self, event: dict):
+        """Atualiza dados do último candle no header."""
+        data = event['data']
+        self.last_candle['open'] = data['open']
+        self.last_candle['high'] = data['high']
+        self.last_candle['low'] = data['low']
+        self.last_candle['close'] = data['close']
+        self.last_candle['volume'] = data.get('volume', 0)
+        self.last_candle['timestamp'] = data.get('timestamp')
+        
+        time_str, ohlc_text = event['header']
+        self.candle_time_label.config(text=time_str)
+        self.ohlc_label.config(text=ohlc_text)
+    
+    def _process_update(self, event: dict):
+        """
+        Insere uma atualização já formatada nos grids e no gráfico.
+        
+        Header, trim e auto-scroll ficam a cargo de _process_updates_batch.
+        
+        Args:
+            event: Evento montado por _format_update
         """
         try:
-            # Atualiza dados do último candle no header
-            if 'open' in data and 'high' in data and 'low' in data and 'close' in data:
-                self.last_candle['open'] = data['open']
-                self.last_candle['high'] = data['high']
-                self.last_candle['low'] = data['low']
-                self.last_candle['close'] = data['close']
-                self.last_candle['volume'] = data.get('volume', 0)
-                self.last_candle['timestamp'] = data.get('timestamp')
-                
-                # Atualiza hora do candle (UTC)
-                timestamp = data.get('timestamp', datetime.now())
-                if isinstance(timestamp, str):
-                    timestamp = datetime.fromisoformat(timestamp)
-                
-                # Formata hora UTC (HH:MM:SS)
-                time_str = timestamp.strftime('%H:%M:%S')
-                self.candle_time_label.config(text=time_str)
-                
-                # Formata OHLC
-                o = self.last_candle['open']
-                h = self.last_candle['high']
-                l = self.last_candle['low']
-                c = self.last_candle['close']
-                
-                ohlc_text = f"O: {o:.2f} | H: {h:.2f} | L: {l:.2f} | C: {c:.2f}"
-                self.ohlc_label.config(text=ohlc_text)
-            
-            # Formata data/hora para o log (UTC no formato DD/MM/YYYY HH:MM:SS)
-            timestamp = data.get('timestamp', datetime.now())
-            if isinstance(timestamp, str):
-                timestamp = datetime.fromisoformat(timestamp)
-            
-            datetime_str = timestamp.strftime('%d/%m/%Y %H:%M:%S')
-            
-            # Formata tipo
-            event_type = data.get('type', 'TICK')
-            
-            # Formata preço
-            price = data.get('close', data.get('price', 0.0))
-            price_str = f"R$ {price:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
-            
-            # Formata probabilidade
-            probability = data.get('probability', 0.0)
-            prob_str = f"{probability:.1f}"
-            
-            # Mensagem
-            message = data.get('message', '')
+            tags = event['tags']
+            event_type = event['type']
+            if event_type not in self._known_tags:
+                self.logs_tree.tag_configure(event_type, background='#ffffff')
+                self._known_tags.add(event_type)
             
             # === ADICIONA AO GRID ML (PRINCIPAL) ===
-            self.logs_tree.insert(
-                '',
-                0,
-                values=(datetime_str, event_type, price_str, prob_str, message),
-                tags=(event_type,)
-            )
-            
-            # === ADICIONA AO GRID ANÁLISE ===
-            # Formata tendência
-            trend = data.get('trend', 'N/A')
-            trend_strength = data.get('trend_strength', '')
-            if trend_strength and trend != 'N/A':
-                trend_str = f"{trend} ({trend_strength[0]})"
-            else:
-                trend_str = trend
+            self.logs_tree.insert('', 0, values=event['logs_row'], tags=tags)
+            self._logs_count += 1
             
-            # Formata RSI
-            rsi = data.get('rsi', 0.0)
-            rsi_condition = data.get('rsi_condition', '')
-            if rsi > 0:
-                rsi_str = f"{rsi:.0f}"
-                if rsi_condition == 'SOBRECOMPRADO':
-                    rsi_str += " 🔺"
-                elif rsi_condition == 'SOBREVENDIDO':
-                    rsi_str += " 🔻"
+            # === ADICIONA AO GRID ANÁLISE (ou ao backlog se oculto) ===
+            if self.analysis_grid_visible:
+                self.analysis_tree.insert('', 0, values=event['analysis_row'], tags=tags)
+                self._analysis_count += 1
             else:
-                rsi_str = "N/A"
-            
-            # Formata EMAs/SMAs
-            ema9 = data.get('ema_fast', 0.0)
-            sma20 = data.get('sma_fast', 0.0)
-            sma50 = data.get('sma_slow', 0.0)
-            
-            ema9_str = f"{ema9:.0f}" if ema9 > 0 else "N/A"
-            sma20_str = f"{sma20:.0f}" if sma20 > 0 else "N/A"
-            sma50_str = f"{sma50:.0f}" if sma50 > 0 else "N/A"
-            
-            self.analysis_tree.insert(
-                '',
-                0,
-                values=(datetime_str, trend_str, rsi_str, ema9_str, sma20_str, sma50_str),
-                tags=(event_type,)
-            )
-            
-            # Limita número de linhas em ambos os grids (máximo 1000)
-            for tree in [self.logs_tree, self.analysis_tree]:
-                children = tree.get_children()
-                if len(children) > 1000:
-                    for item in children[1000:]:
-                        tree.delete(item)
-            
-            # Auto-scroll para o topo (mostra evento mais recente)
-            if children:
-                self.logs_tree.see(children[0])
+                self._analysis_backlog.append((event['analysis_row'], tags))
             
             # === ATUALIZA GRÁFICO DE CANDLESTICK ===
             if self.chart_widget:
+                data = event['data']
+                price = data.get('close', data.get('price', 0.0))
                 try:
                     # Monta dict de candle para o chart
                     candle_dict = {
-                        'time': timestamp,
+                        'time': data['timestamp'],
                         'open': data.get('open', price),
                         'high': data.get('high', price),
                         'low': data.get('low', price),
@@ -770,17 +992,19 @@ class MonitorApp:
                         resistance=data.get('resistance')
                     )
                 except Exception as chart_error:
-                    logger.warning(f"Erro ao atualizar gráfico: {chart_error}")
+                    logger.warning("Erro ao atualizar gráfico: %s", chart_error)
         
         except Exception as e:
-            logger.error(f"Erro ao processar atualização: {e}", exc_info=True)
+            logger.error("Erro ao processar atualização: %s", e)
     
     def _clear_logs(self):
         """Limpa todos os logs de ambos os Treeviews e o gráfico."""
-        for item in self.logs_tree.get_children():
-            self.logs_tree.delete(item)
-        for item in self.analysis_tree.get_children():
-            self.analysis_tree.delete(item)
+        self.logs_tree.delete(*self.logs_tree.get_children())
+        if self.analysis_tree is not None:
+            self.analysis_tree.delete(*self.analysis_tree.get_children())
+        self._logs_count = 0
+        self._analysis_count = 0
+        self._analysis_backlog.clear()
         
         # Limpa gráfico também
         if self.chart_widget:
@@ -869,23 +1093,25 @@ class MonitorApp:
         buffer_tree.column('volume', width=100, anchor=tk.E)
         
         # Popula dados (ordem reversa - mais recentes primeiro)
+        # Formatação vetorizada: timestamps e preços viram arrays de strings de uma vez
         df = self.monitor.buffer_df
-        for idx in reversed(df.index):
-            row = df.loc[idx]
-            timestamp_str = idx.strftime('%Y-%m-%d %H:%M:%S')
-            
+        ts = df.index.strftime('%Y-%m-%d %H:%M:%S').to_numpy()
+        prices = np.char.mod('%.2f', df[['open', 'high', 'low', 'close']].to_numpy(dtype=np.float64))
+        if 'volume' in df.columns:
+            vols = df['volume'].to_numpy(dtype=np.int64)
+        else:
+            vols = np.zeros(len(df), dtype=np.int64)
+        
+        # Suspende o layout das colunas durante a carga em massa
+        buffer_tree.configure(displaycolumns=())
+        for i in range(len(df) - 1, -1, -1):
+            p = prices[i]
             buffer_tree.insert(
                 '',
                 'end',
-                values=(
-                    timestamp_str,
-                    f"{row['open']:.2f}",
-                    f"{row['high']:.2f}",
-                    f"{row['low']:.2f}",
-                    f"{row['close']:.2f}",
-                    int(row.get('volume', 0))
-                )
+                values=(ts[i], p[0], p[1], p[2], p[3], int(vols[i]))
             )
+        buffer_tree.configure(displaycolumns='#all')
         
         # Botão fechar
         close_btn = ttk.Button(
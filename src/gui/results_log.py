@@ -0,0 +1,24 @@
+# src/gui/results_log.py
+"""Esquema do log CSV de resultados do UnifiedDashboard (sem dependência de MT5/Tk)."""
+
+# Esquemas dos resultados registrados, mantidos num único lugar:
+# SimulationEngine.run_simulation_cycle (sim) e LiveTrader._process_asset, mensagem type="update" (live)
+_SIM_RESULT_FIELDS = ["datetime", "asset", "timeframe", "current_price", "ai_signal", "ai_signal_code", "setup_is_valid",
+                      "setup_details", "final_signal", "stop_loss", "take_profit", "indicators", "error"]
+_LIVE_RESULT_FIELDS = ["datetime", "asset", "price", "ai_signal", "setup_valid", "final_signal", "position", "setup_details"]
+_NESTED_LOG_FIELDS = {"indicators": "indicators_json", "setup_details": "setup_details_json"} # Dicts aninhados vão serializados
+# Colunas do CSV: união dos dois esquemas (+ campos adicionados pelo dashboard), sem duplicatas e em ordem estável
+LOG_FIELDS = list(dict.fromkeys(
+    ["log_timestamp", "type"]
+    + [_NESTED_LOG_FIELDS.get(k, k) for k in _SIM_RESULT_FIELDS + _LIVE_RESULT_FIELDS]
+    + ["price_precision"]
+))
+LOG_FIELDS_SET = frozenset(LOG_FIELDS)
+
+def to_log_row(entry):
+    """Converte um resultado (sim ou live) em linha do CSV, serializando dicts aninhados sem alterar o original."""
+    if not any(isinstance(entry.get(k), dict) for k in _NESTED_LOG_FIELDS): return entry
+    row = dict(entry)
+    for key, json_key in _NESTED_LOG_FIELDS.items():
+        if isinstance(row.get(key), dict): row[json_key] = str(row.pop(key))
+    return row
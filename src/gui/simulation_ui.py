@@ -7,11 +7,13 @@ from __future__ import annotations
 
 import sys
 import os
+import copy
 import threading
+from concurrent.futures import ThreadPoolExecutor
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from datetime import datetime
-from typing import Dict, Any, Optional, List
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple
 
 # Ajuste de path antes dos imports do pacote interno
 ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # src directory
@@ -20,9 +22,8 @@ if PROJECT_DIR not in sys.path:
     sys.path.insert(0, PROJECT_DIR)
 
 import yaml
+import numpy as np
 import pandas as pd
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 from src.utils.logger import logger
 from src.simulation.daytrade_engine import DayTradeEngine
@@ -30,9 +31,56 @@ from src.strategies.lstm_volatility import LSTMVolatilityStrategy
 from src.data_handler.provider import get_provider_instance
 
 CONFIG_PATH = os.path.join(PROJECT_DIR, "configs", "main.yaml")
+# Cache em disco das features (mesmo diretório de cache do provider de dados)
+FEATURES_CACHE_DIR = os.path.join(PROJECT_DIR, ".cache_data", "features")
+_FEATURES_MEM_MAX = 4
+_FEATURES_DISK_MAX = 32  # Parquets mantidos em disco (os menos usados recentemente são removidos)
+
+# Cache LRU de YAMLs parseados: path -> (mtime, size, dados). Validado por mtime+size.
+_YAML_CACHE: "OrderedDict[str, Tuple[float, int, Dict[str, Any]]]" = OrderedDict()
+_YAML_CACHE_MAX = 16
+
+
+def _load_yaml_cached(path: str) -> Dict[str, Any]:
+    """Carrega um YAML reaproveitando o parse anterior se o arquivo não mudou.
+
+    Retorna sempre uma cópia profunda, então o chamador pode alterar o dict livremente.
+    """
+    st = os.stat(path)
+    key = (st.st_mtime, st.st_size)
+    hit = _YAML_CACHE.get(path)
+    if hit is not None and hit[:2] == key:
+        _YAML_CACHE.move_to_end(path)
+        return copy.deepcopy(hit[2])
+    with open(path, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+    _YAML_CACHE[path] = (key[0], key[1], data)
+    _YAML_CACHE.move_to_end(path)
+    while len(_YAML_CACHE) > _YAML_CACHE_MAX:
+        _YAML_CACHE.popitem(last=False)
+    return copy.deepcopy(data)
+
+
+def _prune_features_cache() -> None:
+    """Mantém no máximo _FEATURES_DISK_MAX parquets de features, removendo os de uso mais antigo."""
+    try:
+        entries = [e for e in os.scandir(FEATURES_CACHE_DIR) if e.name.startswith("FEAT_") and e.name.endswith(".parquet")]
+    except OSError:
+        return
+    if len(entries) <= _FEATURES_DISK_MAX:
+        return
+    entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+    for entry in entries[_FEATURES_DISK_MAX:]:
+        try:
+            os.remove(entry.path)
+        except OSError as exc:
+            logger.warning(f"Erro ao remover cache de features {entry.path}: {exc}")
 
 
 class SimulationApp(tk.Tk):
+    # Linhas do log de trades inseridas por página (o Treeview não é virtualizado)
+    TRADE_PAGE = 500
+
     def __init__(self) -> None:
         super().__init__()
         self.title("WTNPS DayTrade Simulation")
@@ -59,6 +107,21 @@ class SimulationApp(tk.Tk):
         self.trades: List[Dict[str, Any]] = []
         self.equity_curve: List[Dict[str, Any]] = []
         self.cancel_flag: bool = False
+        # Features já calculadas por (ativo, tf, período, último candle, nº de candles)
+        self._features_cache: "OrderedDict[Tuple, pd.DataFrame]" = OrderedDict()
+        # Log de trades paginado: linhas pré-formatadas e quantas já estão no Treeview
+        self._trade_rows: List[tuple] = []
+        self._trade_shown: int = 0
+        self._trade_page_pending: bool = False
+        # Provider de dados e timeframes MT5 resolvidos, reaproveitados entre execuções
+        self._provider = None
+        self._tf_map: Dict[str, Any] = {}
+        # Worker único e persistente: modelo carregado fica residente entre execuções
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sim")
+        self._sim_future = None
+        self._model_key: Optional[str] = None
+        self._model_wrapper = None
+        self._strategy: Optional[LSTMVolatilityStrategy] = None
 
         # Widgets principais
         self.progress_bar: Optional[ttk.Progressbar] = None
@@ -68,11 +131,17 @@ class SimulationApp(tk.Tk):
         self.btn_export: Optional[ttk.Button] = None
         self.trade_tree: Optional[ttk.Treeview] = None
         self.metric_labels: Dict[str, ttk.Label] = {}
-        self.canvas_equity: Optional[FigureCanvasTkAgg] = None
+        # Figure/canvas criados só no primeiro plot (import do matplotlib é caro)
+        self.fig = None
+        self.ax = None
+        self.line = None
+        self.canvas_equity = None
+        self._equity_dirty = False
 
         self._build_layout()
         self._load_config()
         self._wire_events()
+        self.protocol("WM_DELETE_WINDOW", self._on_closing)
 
     # ---------------- Layout -----------------
     def _build_layout(self) -> None:
@@ -179,7 +248,8 @@ class SimulationApp(tk.Tk):
             self.trade_tree.heading(col, text=col.capitalize())
             self.trade_tree.column(col, width=width, anchor=tk.CENTER)
         vsb = ttk.Scrollbar(tv_frame, orient="vertical", command=self.trade_tree.yview)
-        self.trade_tree.configure(yscroll=vsb.set)
+        self.trade_vsb = vsb
+        self.trade_tree.configure(yscrollcommand=self._on_trade_yscroll)
         self.trade_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         vsb.pack(side=tk.RIGHT, fill=tk.Y)
 
@@ -187,12 +257,15 @@ class SimulationApp(tk.Tk):
         eq_frame = ttk.LabelFrame(right, text="Curva de Equity")
         eq_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         self.eq_frame = eq_frame
+        # Redesenha a curva pendente quando o painel volta a ficar visível
+        # <Map> (não <Visibility>, que o Tk não entrega de forma confiável no Windows). Na janela raiz o
+        # binding também recebe o <Map> dos filhos (bindtags) e o da própria janela ao sair de minimizada
+        self.bind("<Map>", self._on_equity_visible, add="+")
 
     # ---------------- Config Load -----------------
     def _load_config(self) -> None:
         try:
-            with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-                cfg = yaml.safe_load(f) or {}
+            cfg = _load_yaml_cached(CONFIG_PATH)
             raw_assets = cfg.get("assets", [])
             normalized: Dict[str, Dict[str, Any]] = {}
             for item in raw_assets:
@@ -229,8 +302,7 @@ class SimulationApp(tk.Tk):
         self.btn_export.configure(state=tk.DISABLED)
         self.progress_label.configure(text="Iniciando...")
         self.progress_bar["value"] = 0
-        thread = threading.Thread(target=self._run_simulation, daemon=True)
-        thread.start()
+        self._sim_future = self._executor.submit(self._run_simulation)
 
     def _on_cancel(self) -> None:
         self.cancel_flag = True
@@ -258,8 +330,7 @@ class SimulationApp(tk.Tk):
 
             # Validação e normalização de datas
             try:
-                start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-                end_dt = datetime.strptime(end_date, "%Y-%m-%d")
+                start_dt, end_dt = pd.to_datetime([start_date, end_date], format="%Y-%m-%d", cache=True)
             except ValueError:
                 self._fail("Formato de data inválido. Use YYYY-MM-DD.")
                 return
@@ -274,10 +345,15 @@ class SimulationApp(tk.Tk):
             extended_start_date = extended_start_dt.strftime("%Y-%m-%d")
 
             # Provider e dados (carrega período estendido para cálculo de features)
-            provider = get_provider_instance("MetaTrader5")  # default; poderia ser dinâmico
+            # Instância criada (e conectada) só na primeira execução
+            if self._provider is None:
+                self._provider = get_provider_instance("MetaTrader5")  # default; poderia ser dinâmico
+            provider = self._provider
             self._update_progress(5, f"Buscando dados (lookback {lookback_days}d)...")
             if hasattr(provider, "_get_mt5_timeframe"):
-                mt5_tf = provider._get_mt5_timeframe(timeframe)
+                mt5_tf = self._tf_map.get(timeframe)
+                if mt5_tf is None:
+                    mt5_tf = self._tf_map.setdefault(timeframe, provider._get_mt5_timeframe(timeframe))
                 data_df = provider.get_data(ticker=asset, start_date=extended_start_date, end_date=end_date, timeframe=mt5_tf)
             else:
                 data_df = provider.get_data(ticker=asset, start_date=extended_start_date, end_date=end_date, timeframe=timeframe)
@@ -289,41 +365,38 @@ class SimulationApp(tk.Tk):
             model_tf_map = {"M5": "M15", "M15": "M15", "M1": "M5", "M30": "M15", "H1": "H1", "H4": "H1"}
             model_tf = model_tf_map.get(timeframe, timeframe)
             model_prefix = os.path.join(PROJECT_DIR, "models", f"{asset}_LSTMVolatilityStrategy_{model_tf}_prod")
-            strategy = LSTMVolatilityStrategy()
-            try:
-                model_wrapper = strategy.load(model_prefix)
-            except Exception as exc:
-                self._fail(f"Falha ao carregar modelo: {exc}")
-                return
+            if self._model_key == model_prefix:
+                strategy, model_wrapper = self._strategy, self._model_wrapper
+            else:
+                strategy = LSTMVolatilityStrategy()
+                try:
+                    model_wrapper = strategy.load(model_prefix)
+                except Exception as exc:
+                    self._fail(f"Falha ao carregar modelo: {exc}")
+                    return
+                self._model_key, self._strategy, self._model_wrapper = model_prefix, strategy, model_wrapper
 
             self._update_progress(15, "Gerando features...")
-            features_df = strategy.define_features(data_df)
+            features_df = self._get_features(strategy, data_df, asset, timeframe, extended_start_date, end_date)
             feature_cols = strategy.get_feature_names()
             missing = [c for c in feature_cols if c not in features_df.columns]
             if missing:
                 self._fail(f"Features ausentes: {missing}")
                 return
 
-            # Filtra janela de simulação (mantém lookback apenas para cálculo anterior)
-            idx_tz = getattr(features_df.index, "tz", None)
-            if idx_tz is not None:
-                sim_start_ts = pd.Timestamp(start_dt, tz=idx_tz)
-                sim_end_ts = pd.Timestamp(end_dt, tz=idx_tz) + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
-            else:
-                sim_start_ts = pd.Timestamp(start_dt)
-                sim_end_ts = pd.Timestamp(end_dt) + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
-            try:
-                simulation_df = features_df[(features_df.index >= sim_start_ts) & (features_df.index <= sim_end_ts)]
-            except Exception as f_exc:
-                logger.warning(f"Falha em comparação timezone; removendo tz para filtro: {f_exc}")
-                # fallback: remove tz e usa timestamps ingênuos
-                try:
-                    features_df_no_tz = features_df.copy()
-                    features_df_no_tz.index = features_df_no_tz.index.tz_convert(None)
-                    simulation_df = features_df_no_tz[(features_df_no_tz.index >= pd.Timestamp(start_dt)) & (features_df_no_tz.index <= pd.Timestamp(end_dt) + pd.Timedelta(days=1) - pd.Timedelta(seconds=1))]
-                except Exception as f2_exc:
-                    self._fail(f"Erro ao aplicar filtro de datas: {f2_exc}")
-                    return
+            # Filtra janela de simulação (mantém lookback apenas para cálculo anterior).
+            # Índice ordenado + searchsorted: dois cortes O(log N), sem máscaras booleanas.
+            # Com tz, compara no horário local do próprio índice (tz_localize(None))
+            if not features_df.index.is_monotonic_increasing:
+                features_df = features_df.sort_index()
+            cmp_index = features_df.index
+            if getattr(cmp_index, "tz", None) is not None:
+                cmp_index = cmp_index.tz_localize(None)
+            sim_start_ts = pd.Timestamp(start_dt)
+            sim_end_ts = pd.Timestamp(end_dt) + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
+            lo = cmp_index.searchsorted(sim_start_ts, side="left")
+            hi = cmp_index.searchsorted(sim_end_ts, side="right")
+            simulation_df = features_df.iloc[lo:hi]
             if simulation_df.empty:
                 self._fail("Sem dados suficientes após aplicar lookback e filtro de datas.")
                 return
@@ -340,38 +413,67 @@ class SimulationApp(tk.Tk):
 
             self.trades.clear()
             self.equity_curve.clear()
-            probs_cache: List[float] = []
 
-            total = len(simulation_df)
-            for idx in range(total):
+            sim_positions = features_df.index.get_indexer(simulation_df.index)
+            # Timestamps convertidos uma única vez (evita .index[...] + to_pydatetime por barra)
+            sim_times = simulation_df.index.to_pydatetime()
+
+            # Inferência em lote: uma única passada do modelo sobre todo o histórico
+            # (inclui período anterior para manter contexto). predict_proba devolve uma
+            # linha por janela de lookback, então a probabilidade da barra na posição k
+            # (equivalente a prever sobre features_df.iloc[:k+1]) é all_proba[k - offset].
+            self._update_progress(28, "Calculando probabilidades...")
+            n_rows = int(sim_positions[-1]) + 1
+            # Matriz de features extraída para NumPy uma vez; a inferência recebe o ndarray direto.
+            # float32: a LSTM roda em float32, então metade da banda sem perda efetiva
+            X = features_df[feature_cols].to_numpy(dtype=np.float32)[:n_rows]
+            all_proba = model_wrapper.predict_proba(X)
+            offset = n_rows - len(all_proba)
+
+            # Colunas usadas pela engine como arrays contíguos (SoA), montados uma única vez.
+            # ATR ausente vira 0.0 e EMA ausente/NaN cai para o close (mesmo fallback de antes)
+            n_feat = len(features_df)
+            close_col = features_df["close"].to_numpy(dtype=np.float64)
+            atr_col = features_df["atr"].to_numpy(dtype=np.float64) if "atr" in features_df.columns else np.zeros(n_feat)
+            ema_col = features_df["ema_9"].to_numpy(dtype=np.float64) if "ema_9" in features_df.columns else close_col
+            ema_col = np.where(np.isnan(ema_col), close_col, ema_col)
+            ohlc = np.column_stack((
+                features_df["open"].to_numpy(dtype=np.float64),
+                features_df["high"].to_numpy(dtype=np.float64),
+                features_df["low"].to_numpy(dtype=np.float64),
+                close_col,
+                atr_col,
+                ema_col,
+            ))
+
+            # Só barras com janela completa de histórico entram na engine
+            valid = sim_positions >= offset
+            positions = sim_positions[valid]
+            times = sim_times[valid]
+            bars = ohlc[positions]
+            probs_cache = all_proba[positions - offset, 1].astype(np.float32)
+            n_bars = len(positions)
+
+            # Engine em blocos via run_batch (~50 blocos): progresso e cancelamento entre blocos
+            step = max(1, n_bars // 50)
+            for start in range(0, n_bars, step):
                 if self.cancel_flag:
                     self._update_progress(100, "Cancelado")
                     self._finish(cancelled=True)
                     return
-                if idx % max(1, total // 50) == 0:
-                    pct = int((idx / total) * 60) + 30
-                    self._update_progress(pct, f"Processando {idx}/{total}")
-
-                # Usa todo histórico até o ponto (inclui período anterior para manter contexto)
-                window_df = features_df.iloc[: features_df.index.get_indexer([simulation_df.index[idx]])[0] + 1]
-                proba_arr = model_wrapper.predict_proba(window_df[feature_cols])
-                if len(proba_arr) == 0:
-                    continue
-                signal_prob = float(proba_arr[-1, 1])
-                probs_cache.append(signal_prob)
-                row = window_df.iloc[-1]
-                atr = float(row.get("atr", 0.0))
-                ema_trend = float(row.get("ema_9", row.get("close")))
-                ts = window_df.index[-1].to_pydatetime()
-                engine.update(
-                    timestamp=ts,
-                    open_p=float(row.get("open")),
-                    high=float(row.get("high")),
-                    low=float(row.get("low")),
-                    close=float(row.get("close")),
-                    signal_prob=signal_prob,
-                    atr=atr,
-                    ema_trend=ema_trend,
+                pct = int((start / n_bars) * 60) + 30
+                self._update_progress(pct, f"Processando {start}/{n_bars}")
+                end = start + step
+                block = bars[start:end]
+                engine.run_batch(
+                    times[start:end],
+                    block[:, 0],
+                    block[:, 1],
+                    block[:, 2],
+                    block[:, 3],
+                    probs_cache[start:end],
+                    block[:, 4],
+                    block[:, 5],
                 )
 
             self.trades = engine.trades
@@ -383,11 +485,53 @@ class SimulationApp(tk.Tk):
             self._fail(f"Erro inesperado: {exc}")
 
     # ---------------- Helpers -----------------
+    def _get_features(self, strategy: LSTMVolatilityStrategy, data_df: pd.DataFrame, asset: str,
+                      timeframe: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """Retorna define_features(data_df) memoizado em memória e em parquet.
+
+        Só threshold/vol mult./capital/horários mudando entre execuções não recalcula features.
+        """
+        last_ts = data_df.index[-1]
+        # Hash do frame inteiro: candle em formação ou barra antiga revisada mantém last_ts/len mas muda o conteúdo
+        content = f"{int(pd.util.hash_pandas_object(data_df, index=True).sum()) & 0xFFFFFFFFFFFF:012x}"
+        key = (asset, timeframe, start_date, end_date, str(last_ts), len(data_df), content)
+        cached = self._features_cache.get(key)
+        if cached is not None:
+            self._features_cache.move_to_end(key)
+            return cached
+
+        cache_file = os.path.join(
+            FEATURES_CACHE_DIR,
+            f"FEAT_{asset.replace('$', '')}_{timeframe}_{start_date}_{end_date}_{last_ts:%Y%m%d%H%M}_{len(data_df)}_{content}.parquet",
+        )
+        features_df = None
+        if os.path.exists(cache_file):
+            try:
+                features_df = pd.read_parquet(cache_file)
+                os.utime(cache_file)  # mtime = último uso, base da poda LRU em disco
+                logger.info(f"Features carregadas do cache: {cache_file}")
+            except Exception as exc:
+                logger.warning(f"Erro ao ler cache de features {cache_file}: {exc}. Recalculando.")
+        if features_df is None:
+            features_df = strategy.define_features(data_df)
+            try:
+                os.makedirs(FEATURES_CACHE_DIR, exist_ok=True)
+                features_df.to_parquet(cache_file, index=True, compression="snappy")
+                _prune_features_cache()
+            except Exception as exc:
+                logger.warning(f"Erro ao salvar cache de features {cache_file}: {exc}")
+
+        self._features_cache[key] = features_df
+        while len(self._features_cache) > _FEATURES_MEM_MAX:
+            self._features_cache.popitem(last=False)
+        return features_df
+
     def _update_progress(self, value: int, text: str) -> None:
         def cb():
             self.progress_bar["value"] = value
             self.progress_label.configure(text=text)
-        self.after(0, cb)
+        # after_idle: Tk aplica o progresso junto com o próximo redesenho
+        self.after_idle(cb)
 
     def _fail(self, msg: str) -> None:
         logger.error(msg)
@@ -398,7 +542,7 @@ class SimulationApp(tk.Tk):
             self.progress_label.configure(text="Falha")
         self.after(0, cb)
 
-    def _finish(self, summary: Dict[str, Any] | None = None, probs: List[float] | None = None, cancelled: bool = False) -> None:
+    def _finish(self, summary: Dict[str, Any] | None = None, probs: np.ndarray | None = None, cancelled: bool = False) -> None:
         def cb():
             if cancelled:
                 messagebox.showinfo("Cancelado", "Simulação cancelada.")
@@ -418,10 +562,11 @@ class SimulationApp(tk.Tk):
         total_trades = summary.get("total_trades", 0)
         gross_pnl = summary.get("gross_pnl", 0.0)
         win_rate = summary.get("win_rate_pct", 0.0)
-        wins = sum(1 for t in self.trades if t["pnl"] > 0)
-        losses = sum(1 for t in self.trades if t["pnl"] <= 0)
-        sum_pos = sum(t["pnl"] for t in self.trades if t["pnl"] > 0)
-        sum_neg = sum(t["pnl"] for t in self.trades if t["pnl"] < 0)
+        # Agregação em uma única passada NumPy
+        pnls = np.fromiter((t["pnl"] for t in self.trades), dtype=np.float64, count=len(self.trades))
+        pos_mask = pnls > 0
+        sum_pos = float(pnls[pos_mask].sum())
+        sum_neg = float(pnls[~pos_mask].sum())  # pnl == 0 não altera a soma
         profit_factor = sum_pos / abs(sum_neg) if sum_neg < 0 else 0.0
         self.metric_labels["total_pnl"].configure(text=f"{gross_pnl:.2f}")
         self.metric_labels["win_rate"].configure(text=f"{win_rate:.2f}%")
@@ -429,35 +574,89 @@ class SimulationApp(tk.Tk):
         self.metric_labels["profit_factor"].configure(text=f"{profit_factor:.2f}")
 
     def _populate_trades(self) -> None:
-        for row in self.trade_tree.get_children():
-            self.trade_tree.delete(row)
-        for t in self.trades:
-            self.trade_tree.insert("", tk.END, values=(
-                t["exit_time"].strftime("%Y-%m-%d %H:%M"),
-                t["type"],
-                f"{t['entry_price']:.2f}",
-                f"{t['exit_price']:.2f}",
-                f"{t['pnl']:.2f}",
-                t["reason"],
-            ))
+        tree = self.trade_tree
+        tree.delete(*tree.get_children())
+        self._trade_rows = []
+        self._trade_shown = 0
+        if not self.trades:
+            return
+        # Pré-formata todas as linhas de uma vez (strftime e %.2f vetorizados)
+        trades = self.trades
+        exit_str = pd.DatetimeIndex([t["exit_time"] for t in trades]).strftime("%Y-%m-%d %H:%M")
+        prices = np.char.mod("%.2f", np.array(
+            [(t["entry_price"], t["exit_price"], t["pnl"]) for t in trades], dtype=np.float64))
+        self._trade_rows = [
+            (exit_str[i], t["type"], p[0], p[1], p[2], t["reason"])
+            for i, (t, p) in enumerate(zip(trades, prices.tolist()))
+        ]
+        self._trade_shown = 0
+        self._append_trade_page()
+
+    def _append_trade_page(self) -> None:
+        """Insere a próxima página de trades no Treeview."""
+        self._trade_page_pending = False
+        start = self._trade_shown
+        page = self._trade_rows[start:start + self.TRADE_PAGE]
+        if not page:
+            return
+        tree = self.trade_tree
+        # Suspende o layout das colunas durante a carga em massa
+        tree["displaycolumns"] = ()
+        for values in page:
+            tree.insert("", tk.END, values=values)
+        tree["displaycolumns"] = "#all"
+        self._trade_shown = start + len(page)
+
+    def _on_trade_yscroll(self, first: str, last: str) -> None:
+        """yscrollcommand do log: repassa à scrollbar e carrega a próxima página perto do fim."""
+        self.trade_vsb.set(first, last)
+        if (float(last) >= 0.95 and self._trade_shown < len(self._trade_rows)
+                and not self._trade_page_pending):
+            self._trade_page_pending = True
+            self.after_idle(self._append_trade_page)
+
+    def _ensure_equity_canvas(self) -> None:
+        """Cria Figure/Axes/canvas uma única vez, no primeiro plot."""
+        if self.canvas_equity is not None:
+            return
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+        self.fig = Figure(figsize=(6, 3), dpi=100)
+        self.ax = self.fig.add_subplot(111)
+        self.line, = self.ax.plot([], [], color="#1f5c99", linewidth=1.6)
+        self.ax.xaxis_date()
+        self.ax.set_xlabel("Tempo")
+        self.ax.set_ylabel("Capital")
+        self.ax.grid(alpha=0.3)
+        # Margens fixas: tight_layout re-resolve o layout a cada chamada
+        self.fig.subplots_adjust(left=0.1, right=0.98, top=0.95, bottom=0.15)
+        self.canvas_equity = FigureCanvasTkAgg(self.fig, master=self.eq_frame)
+        self.canvas_equity.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
     def _plot_equity(self) -> None:
-        if self.canvas_equity:
-            self.canvas_equity.get_tk_widget().destroy()
-        if not self.equity_curve:
+        # Painel oculto (janela minimizada/encoberta): adia o render Agg até voltar a aparecer
+        if not self.eq_frame.winfo_viewable():
+            self._equity_dirty = True
             return
-        fig = Figure(figsize=(6, 3), dpi=100)
-        ax = fig.add_subplot(111)
+        self._equity_dirty = False
+        self._ensure_equity_canvas()
+        # Atualiza apenas os dados da linha existente; sem recriar Figure/Axes/canvas
         times = [e["time"] for e in self.equity_curve]
-        equity = [e["equity"] for e in self.equity_curve]
-        ax.plot(times, equity, color="#1f5c99", linewidth=1.6)
-        ax.set_xlabel("Tempo")
-        ax.set_ylabel("Capital")
-        ax.grid(alpha=0.3)
-        fig.tight_layout()
-        self.canvas_equity = FigureCanvasTkAgg(fig, master=self.eq_frame)
-        self.canvas_equity.draw()
-        self.canvas_equity.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        equity = np.fromiter((e["equity"] for e in self.equity_curve), dtype=np.float64, count=len(self.equity_curve))
+        self.line.set_data(times, equity)
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.canvas_equity.draw_idle()
+
+    def _on_equity_visible(self, _event=None) -> None:
+        if self._equity_dirty:
+            self._plot_equity()
+
+    def _on_closing(self) -> None:
+        self.cancel_flag = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.destroy()
 
     def _on_export(self) -> None:
         if not self.trades:
@@ -466,12 +665,29 @@ class SimulationApp(tk.Tk):
         file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv")])
         if not file_path:
             return
+        # Escrita em thread separada (em blocos) para não travar a GUI
+        self.btn_export.configure(state=tk.DISABLED)
+        self.progress_label.configure(text="Salvando relatório...")
+        trades = list(self.trades)
+        threading.Thread(target=self._export_trades, args=(trades, file_path), daemon=True).start()
+
+    def _export_trades(self, trades: List[Dict[str, Any]], file_path: str) -> None:
         try:
-            pd.DataFrame(self.trades).to_csv(file_path, index=False)
-            messagebox.showinfo("Sucesso", f"Relatório salvo em {file_path}")
+            pd.DataFrame(trades).to_csv(file_path, index=False, chunksize=10_000)
+            error = None
         except Exception as exc:
-            messagebox.showerror("Erro", f"Falha ao salvar: {exc}")
             logger.exception("Erro export")
+            error = exc
+
+        def cb():
+            self.btn_export.configure(state=tk.NORMAL)
+            if error is None:
+                self.progress_label.configure(text="Relatório salvo")
+                messagebox.showinfo("Sucesso", f"Relatório salvo em {file_path}")
+            else:
+                self.progress_label.configure(text="Falha ao salvar")
+                messagebox.showerror("Erro", f"Falha ao salvar: {error}")
+        self.after(0, cb)
 
 
 def main() -> None:
@@ -3,15 +3,14 @@ import sys
 import yaml
 import logging
 from pathlib import Path
-from datetime import datetime, timedelta
-import pytz
-import time # <<< ADICIONADO IMPORT TIME
+from datetime import datetime, timedelta, timezone
+import time # <<< ADICIONADO IMPORT TIME (gmtime no monitor de mercado)
 import tkinter as tk
 from tkinter import ttk, messagebox, font as tkFont
 from collections import deque
 import csv # Para salvar o log
 import MetaTrader5 as mt5 # <<< ADICIONADO IMPORT MT5
-from threading import Thread
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from queue import Queue, Empty
 
 # Adiciona a raiz do projeto ao path
@@ -22,6 +21,8 @@ if str(project_root) not in sys.path:
 # Importa engines DEPOIS de ajustar o path
 from src.live_trader import LiveTrader # Usado apenas para type hinting e stop
 from src.simulation.engine import SimulationEngine
+from src.utils.config_cache import load_yaml_config
+from src.gui.results_log import LOG_FIELDS, LOG_FIELDS_SET, to_log_row
 
 # Configuração do Logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] (%(name)s) %(message)s')
@@ -39,7 +40,7 @@ class UnifiedDashboard(tk.Tk):
         if self.config is None: self.destroy(); return
 
         # Timezone único e padrão: UTC
-        self.local_tz = pytz.utc
+        self.local_tz = timezone.utc
         logger.info("Dashboard usando timezone: UTC")
 
         self.assets_config_list = self.config.get('assets', [])
@@ -51,13 +52,28 @@ class UnifiedDashboard(tk.Tk):
             if cfg.get('ticker') and cfg.get('live_trading', {}).get('enabled', False)
         }
         self.live_asset_tickers = list(self.live_asset_tickers_config.keys()) # Apenas os tickers habilitados para live
+        # Ticker -> símbolo MT5 consultado no monitor (live_trading.ticker_order, se definido), resolvido uma vez
+        self._ticker_to_mt5symbol = {
+            t: cfg.get('ticker_order', t)
+            for t, cfg in self.live_asset_tickers_config.items()
+        }
+        # Pool para buscar os ticks do monitor em paralelo (chamadas MT5 são IPC bloqueante)
+        self._tick_pool = ThreadPoolExecutor(max_workers=max(1, min(8, len(self.live_asset_tickers))), thread_name_prefix="tick")
 
         self.market_data_auto_refresh = tk.BooleanVar(value=True)
         self.auto_refresh_job_id = None
+        self._next_refresh_deadline = 0.0 # time.monotonic() do próximo auto-refresh
         self.refresh_interval_ms = 60 * 1000 # 1 minuto
+        # Formatadores pré-ligados para o loop do monitor (spec parseado uma vez)
+        self._fmt2 = "{:.2f}".format
+        self._fmt0 = "{:.0f}".format
 
-        self.last_results = deque(maxlen=2)
-        self.all_results_log = []
+        # Dois últimos resultados (recente/anterior) em slots fixos, sem deque/list por chamada
+        self._r0 = None; self._r1 = None
+        # Histórico recente em memória (limitado); o log completo vai direto para o CSV em disco
+        self.all_results_log = deque(maxlen=500)
+        self._log_file = None; self._log_writer = None # Abertos no primeiro resultado
+        self._log_unknown_keys = set() # Chaves fora de LOG_FIELDS já avisadas
 
         self.asset_widgets = {}
         self.queue = Queue()
@@ -75,12 +91,16 @@ class UnifiedDashboard(tk.Tk):
         self._create_widgets()
 
         # --- Inicialização dos Motores em Threads Separadas ---
+        # Pool persistente: reaproveita as threads do SO entre inicializações e simulações
+        self._pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="dash")
         logger.info("Iniciando thread de inicialização do LiveTrader...")
-        Thread(target=self._initialize_trader_engine, daemon=True).start()
+        self._pool.submit(self._initialize_trader_engine)
         logger.info("Iniciando thread de inicialização do SimulationEngine...")
-        Thread(target=self._initialize_simulation_engine, daemon=True).start()
+        self._pool.submit(self._initialize_simulation_engine)
 
-        self.after(100, self._process_queue) # Inicia processador de fila da GUI
+        # Threads sinalizam <<QueueItem>> a cada put: a fila é drenada na hora, sem esperar o polling
+        self.bind("<<QueueItem>>", lambda e: self._drain_queue())
+        self.after(500, self._process_queue) # Inicia processador de fila da GUI (rede de segurança)
         self.protocol("WM_DELETE_WINDOW", self._on_closing)
 
         # Inicia o auto-refresh do monitor de mercado se habilitado
@@ -92,7 +112,7 @@ class UnifiedDashboard(tk.Tk):
         """Carrega configuração YAML."""
         logger.info(f"Carregando config: {self.config_path}")
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f: return yaml.safe_load(f)
+            return load_yaml_config(self.config_path)
         except FileNotFoundError: logger.error(f"Config '{self.config_path}' não encontrado."); messagebox.showerror("Erro", f"'{self.config_path}' não encontrado."); return None
         except yaml.YAMLError as e: logger.error(f"Erro YAML '{self.config_path}': {e}"); messagebox.showerror("Erro", f"Erro config '{self.config_path}':\n{e}"); return None
 
@@ -130,7 +150,7 @@ class UnifiedDashboard(tk.Tk):
         """(Thread) Instancia LiveTrader e aguarda sua init interna."""
         logger.info("Thread Init Trader: Iniciando...")
         try:
-            self.trader_engine = LiveTrader(config_path=self.config_path, callback=self.queue.put)
+            self.trader_engine = LiveTrader(config_path=self.config_path, callback=self._post_to_queue)
             # Espera a thread de inicialização *interna* do LiveTrader
             if hasattr(self.trader_engine, '_init_thread') and self.trader_engine._init_thread:
                 logger.info("Thread Init Trader: Aguardando inicialização interna do LiveTrader...")
@@ -142,7 +162,7 @@ class UnifiedDashboard(tk.Tk):
         except Exception as e:
             logger.critical(f"Falha CRÍTICA ao instanciar/aguardar LiveTrader: {e}", exc_info=True)
             self.is_trader_initialized = False
-            try: self.queue.put({"type": "status", "asset": "GLOBAL", "message": "Live CRÍTICO", "color": "red"})
+            try: self._post_to_queue({"type": "status", "asset": "GLOBAL", "message": "Live CRÍTICO", "color": "red"})
             except Exception: pass # Ignora erro se a fila falhar aqui
         finally: logger.info("Thread Init Trader: Finalizada.")
 
@@ -152,21 +172,23 @@ class UnifiedDashboard(tk.Tk):
         logger.info("Thread Init Sim: Iniciando...")
         try:
             self.simulation_engine = SimulationEngine(config_path=self.config_path)
-            # Tenta pré-carregar recursos do primeiro ativo (se houver)
-            first_ticker = next(iter(self.all_asset_tickers), None)
-            if first_ticker and self.simulation_engine:
-                 logger.info(f"Thread Init Sim: Pré-carregando recursos para {first_ticker}...")
-                 res = self.simulation_engine._load_asset_resources(first_ticker)
-                 if not res or 'error' in res:
-                      logger.warning(f"Falha ao pré-carregar recursos para {first_ticker} no SimulationEngine.")
-                      # Não impede a inicialização, mas loga
+            # Pré-carrega os recursos de todos os ativos; o cache interno do engine (asset_resources)
+            # guarda o resultado e as simulações seguintes não tocam o disco. Sequencial de propósito:
+            # _load_asset_resources não tem lock e carregar modelos Keras em paralelo não é thread-safe
+            if self.all_asset_tickers and self.simulation_engine:
+                 logger.info(f"Thread Init Sim: Pré-carregando recursos para {len(self.all_asset_tickers)} ativo(s)...")
+                 for ticker in self.all_asset_tickers:
+                      res = self.simulation_engine._load_asset_resources(ticker)
+                      if not res or 'error' in res:
+                           logger.warning(f"Falha ao pré-carregar recursos para {ticker} no SimulationEngine.")
+                           # Não impede a inicialização, mas loga
             self.is_simulation_engine_initialized = True
             logger.info("Thread Init Sim: SimulationEngine instanciado.")
-            self.queue.put({"type": "status_sim", "message": "Simulador Pronto", "color": "blue"})
+            self._post_to_queue({"type": "status_sim", "message": "Simulador Pronto", "color": "blue"})
         except Exception as e:
             logger.critical(f"Falha CRÍTICA ao instanciar SimulationEngine: {e}", exc_info=True)
             self.is_simulation_engine_initialized = False
-            self.queue.put({"type": "status_sim", "message": "Erro Simulador", "color": "red"})
+            self._post_to_queue({"type": "status_sim", "message": "Erro Simulador", "color": "red"})
         finally: logger.info("Thread Init Sim: Finalizada.")
 
 
@@ -273,24 +295,18 @@ class UnifiedDashboard(tk.Tk):
             messagebox.showwarning("Atenção", "Selecione um ativo.") 
             return
         
+        # Converte direto para aware em UTC (UTC não tem horários inexistentes/ambíguos)
         try: 
-            dt_utc_naive = datetime.strptime(dt_str, "%Y-%m-%d %H:%M")
+            dt_utc_aware = datetime.strptime(dt_str, "%Y-%m-%d %H:%M").replace(tzinfo=timezone.utc)
         except ValueError: 
             messagebox.showerror("Erro", f"Formato Data/Hora inválido: {dt_str}") 
             return
-        
-        # Converte para aware em UTC
-        try: 
-            dt_utc_aware = pytz.utc.localize(dt_utc_naive)
-        except (pytz.exceptions.NonExistentTimeError, pytz.exceptions.AmbiguousTimeError) as e:
-            messagebox.showerror("Erro Fuso Horário", f"Data/Hora inválida ou ambígua: {e}")
-            return
 
         logger.info(f"Solicitando simulação: {asset} @ {tf} em {dt_utc_aware}")
         self.sim_status_label.config(text="Simulando...", foreground=self.hold_color)
         self.sim_button.config(state=tk.DISABLED)
         
-        Thread(target=self._execute_simulation_thread, args=(asset, tf, dt_utc_aware), daemon=True).start()
+        self._pool.submit(self._execute_simulation_thread, asset, tf, dt_utc_aware)
 
 
     def _execute_simulation_thread(self, asset, tf, dt_utc_aware):
@@ -299,13 +315,13 @@ class UnifiedDashboard(tk.Tk):
         if self.simulation_engine:
             try:
                 result = self.simulation_engine.run_simulation_cycle(asset, tf, dt_utc_aware)
-                self.queue.put({"type": "sim_result", "data": result})
+                self._post_to_queue({"type": "sim_result", "data": result})
             except Exception as e:
                 logger.error(f"Erro thread simulação {asset}: {e}", exc_info=True)
-                self.queue.put({"type": "sim_result", "data": {"error": f"Erro interno simulação: {e}"}})
+                self._post_to_queue({"type": "sim_result", "data": {"error": f"Erro interno simulação: {e}"}})
         else:
              logger.error("SimulationEngine não disponível para executar simulação.")
-             self.queue.put({"type": "sim_result", "data": {"error": "Motor de Simulação indisponível."}})
+             self._post_to_queue({"type": "sim_result", "data": {"error": "Motor de Simulação indisponível."}})
 
 
     def _start_live_click(self):
@@ -357,15 +373,26 @@ class UnifiedDashboard(tk.Tk):
         """Agenda/Reagenda auto-refresh."""
         self._stop_auto_refresh() # Garante que não haja jobs duplicados
         if immediate: self._update_market_monitor() # Executa uma vez agora
-        # Agenda a próxima execução
-        self.auto_refresh_job_id = self.after(self.refresh_interval_ms, self._start_auto_refresh)
-        logger.debug(f"Auto Refresh agendado (Job: {self.auto_refresh_job_id})")
+        # Agenda a próxima execução (prazo em relógio monotônico)
+        self._next_refresh_deadline = time.monotonic() + self.refresh_interval_ms / 1000
+        self.auto_refresh_job_id = self.after(self.refresh_interval_ms, self._auto_refresh_tick)
+        logger.debug("Auto Refresh agendado (Job: %s)", self.auto_refresh_job_id)
+
+
+    def _auto_refresh_tick(self):
+        """Callback do after: só atualiza quando o prazo venceu; se disparou cedo, reagenda o restante."""
+        self.auto_refresh_job_id = None
+        remaining = self._next_refresh_deadline - time.monotonic()
+        if remaining > 0.05:
+            self.auto_refresh_job_id = self.after(int(remaining * 1000), self._auto_refresh_tick)
+            return
+        self._start_auto_refresh()
 
 
     def _stop_auto_refresh(self):
         """Cancela auto-refresh."""
         if self.auto_refresh_job_id:
-            logger.debug(f"Cancelando Auto Refresh (Job: {self.auto_refresh_job_id})")
+            logger.debug("Cancelando Auto Refresh (Job: %s)", self.auto_refresh_job_id)
             self.after_cancel(self.auto_refresh_job_id)
             self.auto_refresh_job_id = None
 
@@ -388,12 +415,13 @@ class UnifiedDashboard(tk.Tk):
         # Verifica se o trader engine e o provider MT5 estão disponíveis
         mt5_conn_ok = False
         provider = None
-        # Acessa o provider de forma segura
-        if self.trader_engine and hasattr(self.trader_engine, '_lock'):
-             with self.trader_engine._lock:
-                  provider = self.trader_engine.mt5_provider
-                  if provider and provider.is_connected():
-                       mt5_conn_ok = True
+        # Leitura sem lock: o engine publica o estado da conexão em _connected_evt. O evento só é
+        # atualizado pelas threads do LiveTrader, então com o monitoramento desligado uma queda do MT5
+        # não o limpa: confirma com provider.is_connected() (só consultado se o evento estiver setado)
+        if self.trader_engine and hasattr(self.trader_engine, '_connected_evt'):
+             provider = self.trader_engine.mt5_provider
+             if provider and self.trader_engine._connected_evt.is_set() and provider.is_connected():
+                  mt5_conn_ok = True
         elif not self.is_trader_initialized: # Se ainda não inicializou, tenta conectar aqui
              if mt5.initialize():
                   mt5_conn_ok = True
@@ -404,8 +432,8 @@ class UnifiedDashboard(tk.Tk):
              # Tenta reconectar através do engine se ele existir
              if self.trader_engine and hasattr(self.trader_engine, '_initialize_mt5'):
                   if self.trader_engine._initialize_mt5():
-                       with self.trader_engine._lock: provider = self.trader_engine.mt5_provider
-                       if provider and provider.is_connected(): mt5_conn_ok = True
+                       provider = self.trader_engine.mt5_provider
+                       if provider and self.trader_engine._connected_evt.is_set() and provider.is_connected(): mt5_conn_ok = True
                   else: logger.error("Falha ao reconectar MT5 para monitor.")
              elif not self.trader_engine: # Se não tem engine, tenta direto
                   if mt5.initialize(): mt5_conn_ok = True
@@ -413,32 +441,40 @@ class UnifiedDashboard(tk.Tk):
 
         if not mt5_conn_ok:
             logger.warning("Não foi possível conectar ao MT5 para atualizar o monitor.")
-            # Limpa a tabela ou mostra mensagem de erro? Limpar por enquanto.
-            for item in self.market_tree.get_children(): self.market_tree.delete(item)
+            # Mantém as linhas fixas dos ativos live (iid = ticker) e só marca como desconectado
+            for idx, ticker in enumerate(self.live_asset_tickers):
+                row_data = (ticker, "Desconectado", "---", "---", "---", "---")
+                if self.market_tree.exists(ticker): self.market_tree.item(ticker, values=row_data)
+                else: self.market_tree.insert("", tk.END, iid=ticker, values=row_data, tags=('even' if idx % 2 == 0 else 'odd',)) # Placeholder ainda não criado
             self._last_monitor_update_time = datetime.now(self.local_tz) # Marca tentativa
             self._update_refresh_status_label()
-            # Reagenda se auto-refresh estiver ligado, para tentar de novo depois
-            if self.market_data_auto_refresh.get() and not self.auto_refresh_job_id:
-                 self.auto_refresh_job_id = self.after(self.refresh_interval_ms, self._start_auto_refresh)
+            # Nova tentativa fica a cargo de _start_auto_refresh / _manual_refresh_click, que sempre reagendam
             return
 
         # Busca ticks para os ativos configurados para LIVE TRADING
         # Usa os tickers definidos em live_trading.ticker_order
-        updated_rows = {}
-        for asset_symbol in self.live_asset_tickers:
-            live_cfg = self.live_asset_tickers_config.get(asset_symbol, {})
-            ticker_to_fetch = live_cfg.get('ticker_order', asset_symbol) # Usa ticker_order se definido
-            tick = None
+        symbols = self._ticker_to_mt5symbol
+        # Um symbol_info_tick por símbolo MT5 por ciclo (vários ativos podem apontar ao mesmo ticker_order),
+        # disparados em paralelo: latência total ~ max(RTT) em vez da soma das chamadas seriais
+        _tick = mt5.symbol_info_tick; submit = self._tick_pool.submit # Resolvidos uma vez fora do loop
+        futures = {submit(_tick, t): t for t in dict.fromkeys(symbols.values())}
+        tick_cache = {}
+        for future in as_completed(futures):
+            ticker_to_fetch = futures[future]
             try:
-                tick = mt5.symbol_info_tick(ticker_to_fetch)
+                tick_cache[ticker_to_fetch] = future.result()
             except Exception as e:
-                logger.warning(f"Erro ao buscar tick para {ticker_to_fetch}: {e}")
-                tick = None # Garante que tick é None em caso de erro
+                logger.warning("Erro ao buscar tick para %s: %s", ticker_to_fetch, e)
+                tick_cache[ticker_to_fetch] = None # Garante que tick é None em caso de erro
 
+        updated_rows = {}
+        fmt2, fmt0 = self._fmt2, self._fmt0
+        for asset_symbol, ticker_to_fetch in symbols.items():
+            tick = tick_cache.get(ticker_to_fetch)
             if tick and tick.time > 0: # Verifica se o tick é válido
-                # Converte timestamp do tick para datetime UTC
-                tick_time_utc = datetime.fromtimestamp(tick.time, tz=pytz.utc)
-                time_str = tick_time_utc.strftime("%H:%M:%S")
+                # Hora UTC do tick direto de time.gmtime (sem objeto tzinfo nem parser do strftime)
+                tm = time.gmtime(tick.time)
+                time_str = f"{tm.tm_hour:02d}:{tm.tm_min:02d}:{tm.tm_sec:02d}"
 
                 # Determina preço atual (ex: último negociado ou média bid/ask)
                 current_price = tick.last if tick.last > 0 else (tick.bid + tick.ask) / 2
@@ -448,11 +484,11 @@ class UnifiedDashboard(tk.Tk):
                 # ("Ticker", "Preço Atual", "Hora (UTC)", "Bid", "Ask", "Volume")
                 row_data = (
                     asset_symbol, # Mostra o ticker principal (WDO$, WIN$)
-                    f"{current_price:.2f}", # Ajuste a precisão se necessário
+                    fmt2(current_price), # Ajuste a precisão se necessário
                     time_str,
-                    f"{tick.bid:.2f}",
-                    f"{tick.ask:.2f}",
-                    f"{volume:.0f}" # Volume como inteiro
+                    fmt2(tick.bid),
+                    fmt2(tick.ask),
+                    fmt0(volume) # Volume como inteiro
                 )
                 updated_rows[asset_symbol] = row_data
             else:
@@ -460,22 +496,15 @@ class UnifiedDashboard(tk.Tk):
                  updated_rows[asset_symbol] = (asset_symbol, "Inválido", "---", "---", "---", "---")
 
 
-        # Atualiza a Treeview
-        items_in_tree = {self.market_tree.item(item, "values")[0]: item for item in self.market_tree.get_children()}
-
-        for ticker, row_data in updated_rows.items():
-             item_id = items_in_tree.get(ticker)
-             if item_id: # Atualiza linha existente
-                  self.market_tree.item(item_id, values=row_data)
-             else: # Insere nova linha (caso algum ativo não estivesse antes)
-                  tag = 'even' if len(self.market_tree.get_children()) % 2 == 0 else 'odd'
-                  self.market_tree.insert("", tk.END, values=row_data, tags=(tag,))
-
-        # Remove linhas da treeview que não estão mais na lista de ativos live (improvável, mas seguro)
-        live_set = set(self.live_asset_tickers)
-        for ticker_in_tree, item_id in items_in_tree.items():
-             if ticker_in_tree not in live_set:
-                  self.market_tree.delete(item_id)
+        # Atualiza a Treeview: o iid de cada linha é o próprio ticker (criado no placeholder),
+        # então não há varredura, mapa reverso nem inserção/remoção (conjunto live é fixo na sessão)
+        # Suspende o layout das colunas durante a atualização em lote (um único relayout no fim)
+        self.market_tree.configure(displaycolumns=())
+        try:
+            for ticker, row_data in updated_rows.items():
+                 self.market_tree.item(ticker, values=row_data)
+        finally:
+            self.market_tree.configure(displaycolumns='#all')
 
         # Atualiza timestamp da última atualização e label
         self._last_monitor_update_time = datetime.now(self.local_tz)
@@ -492,9 +521,9 @@ class UnifiedDashboard(tk.Tk):
          # Limpa antes de popular
          for item in self.market_tree.get_children(): self.market_tree.delete(item)
          # Adiciona placeholders para ativos LIVE
-         for ticker in self.live_asset_tickers:
-             tag = 'even' if len(self.market_tree.get_children()) % 2 == 0 else 'odd'
-             self.market_tree.insert("", tk.END, values=(ticker, "Carregando...", "...", "...", "...", "..."), tags=(tag,))
+         for idx, ticker in enumerate(self.live_asset_tickers):
+             tag = 'even' if idx % 2 == 0 else 'odd'
+             self.market_tree.insert("", tk.END, iid=ticker, values=(ticker, "Carregando...", "...", "...", "...", "..."), tags=(tag,))
          # Configura cores alternadas
          self.market_tree.tag_configure('even', background='#505050', foreground='white')
          self.market_tree.tag_configure('odd', background='#454545', foreground='white')
@@ -507,14 +536,13 @@ class UnifiedDashboard(tk.Tk):
         # Adiciona tipo (Simulação/Live) se não existir
         if "type" not in result_dict: result_dict["type"] = "Desconhecido"
 
-        # Garante timestamp para o log
-        log_entry = result_dict.copy()
-        log_entry["log_timestamp"] = datetime.now(self.local_tz).isoformat()
+        # Garante timestamp para o log (o dict só é lido daqui em diante: dispensa cópia)
+        result_dict["log_timestamp"] = datetime.now(self.local_tz).isoformat()
 
-        self.all_results_log.append(log_entry) # Guarda cópia com timestamp
-        self.last_results.append(result_dict) # Guarda original para display
+        self.all_results_log.append(result_dict)
+        self._write_log_row(result_dict)
+        self._r1 = self._r0; self._r0 = result_dict # Rotaciona slots para display
 
-        results = list(self.last_results)
         prec = result_dict.get('price_precision', 2) # Usa precisão do ativo se disponível
 
         def format_res(res):
@@ -523,13 +551,13 @@ class UnifiedDashboard(tk.Tk):
             tp_str = f"{res.get('take_profit','?'):.{prec}f}" if isinstance(res.get('take_profit'), (int, float)) else "N/A"
             return f"[{res.get('datetime','')}] ({res.get('type','?')}) {res.get('asset','?')}/{res.get('timeframe','?')}: Sinal={res.get('final_signal','?')}, P={price_str}, SL={sl_str}, TP={tp_str}, Pos={res.get('position','---')}"
 
-        res1_str = format_res(results[-1]) if len(results) > 0 else "---"
-        self.result_label_1.config(text=f"Recente: {res1_str}")
-        self._color_result_label(self.result_label_1, results[-1].get('final_signal') if len(results) > 0 else None)
+        r0, r1 = self._r0, self._r1
+        self.result_label_1.config(text=f"Recente: {format_res(r0)}")
+        self._color_result_label(self.result_label_1, r0.get('final_signal'))
 
-        res2_str = format_res(results[-2]) if len(results) > 1 else "---"
+        res2_str = format_res(r1) if r1 is not None else "---"
         self.result_label_2.config(text=f"Anterior: {res2_str}")
-        self._color_result_label(self.result_label_2, results[-2].get('final_signal') if len(results) > 1 else None)
+        self._color_result_label(self.result_label_2, r1.get('final_signal') if r1 is not None else None)
 
     def _color_result_label(self, label, signal):
          """Aplica estilo ao label de resultado baseado no sinal."""
@@ -539,34 +567,40 @@ class UnifiedDashboard(tk.Tk):
          else: label.config(style="Hold.TLabel") # HOLD ou ---
 
 
-    def _save_log_to_csv(self):
-        """Salva log completo em CSV."""
-        if not self.all_results_log: logger.info("Nenhum resultado para salvar."); return
-        log_dir = Path("logs"); log_dir.mkdir(exist_ok=True)
-        filename = log_dir / f"unified_dashboard_log_{datetime.now():%Y%m%d_%H%M%S}.csv"
+    def _write_log_row(self, entry):
+        """Grava um resultado no CSV de log (streaming, uma linha por resultado)."""
         try:
-            # Pega cabeçalhos do último registro (mais provável ter todas as chaves)
-            # Adiciona colunas para dicts serializados
-            headers = list(self.all_results_log[-1].keys())
-            if 'indicators' in headers: headers.remove('indicators'); headers.append('indicators_json')
-            if 'setup_details' in headers: headers.remove('setup_details'); headers.append('setup_details_json')
-            if 'log_timestamp' not in headers: headers.insert(0, 'log_timestamp') # Garante timestamp
-
-            with open(filename, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=headers, extrasaction='ignore')
-                writer.writeheader()
-                for row in self.all_results_log:
-                     row_copy = row.copy()
-                     # Serializa dicts aninhados
-                     if isinstance(row_copy.get('indicators'), dict): row_copy['indicators_json'] = str(row_copy.pop('indicators'))
-                     if isinstance(row_copy.get('setup_details'), dict): row_copy['setup_details_json'] = str(row_copy.pop('setup_details'))
-                     writer.writerow(row_copy)
-            logger.info(f"Log de resultados salvo em: {filename}")
-        except ImportError: logger.error("Módulo 'csv' não encontrado para salvar log."); messagebox.showerror("Erro", "Módulo 'csv' não disponível.")
-        except Exception as e: logger.error(f"Erro ao salvar log CSV: {e}", exc_info=True); messagebox.showerror("Erro", f"Erro ao salvar log:\n{e}")
-
-    def _process_queue(self):
-        """Processa eventos da fila da GUI."""
+            if self._log_writer is None:
+                log_dir = Path("logs"); log_dir.mkdir(exist_ok=True)
+                filename = log_dir / f"unified_dashboard_log_{datetime.now():%Y%m%d_%H%M%S}.csv"
+                self._log_file = open(filename, 'a', newline='', encoding='utf-8', buffering=1) # Line-buffered: cada linha vai ao disco
+                self._log_writer = csv.DictWriter(self._log_file, fieldnames=LOG_FIELDS, extrasaction='ignore')
+                self._log_writer.writeheader()
+                logger.info(f"Log de resultados em: {filename}")
+            row = to_log_row(entry)
+            # Chave fora do esquema não cabe no cabeçalho já gravado: avisa (uma vez por chave) em vez de descartar em silêncio
+            unknown = row.keys() - LOG_FIELDS_SET - self._log_unknown_keys
+            if unknown:
+                self._log_unknown_keys |= unknown
+                logger.warning("Chaves fora do esquema do log CSV (não gravadas): %s", sorted(unknown))
+            self._log_writer.writerow(row)
+        except Exception as e: logger.error(f"Erro ao gravar log CSV: {e}", exc_info=True)
+
+    def _close_log_file(self):
+        """Fecha o CSV de log (chamado no fechamento)."""
+        if self._log_file is None: logger.info("Nenhum resultado para salvar."); return
+        try: self._log_file.close(); logger.info(f"Log de resultados salvo em: {self._log_file.name}")
+        except Exception as e: logger.error(f"Erro ao fechar log CSV: {e}", exc_info=True)
+        self._log_file = None; self._log_writer = None
+
+    def _post_to_queue(self, msg):
+        """(Qualquer thread) Enfileira evento para a GUI e sinaliza o loop do Tk para drená-lo."""
+        self.queue.put(msg)
+        try: self.event_generate("<<QueueItem>>", when="tail")
+        except (tk.TclError, RuntimeError): pass # Janela fechando/sem mainloop: o polling drena depois
+
+    def _drain_queue(self):
+        """Processa todos os eventos pendentes na fila da GUI."""
         try:
             while True:
                 msg = self.queue.get_nowait()
@@ -577,11 +611,15 @@ class UnifiedDashboard(tk.Tk):
                 elif msg_type == "status": self._update_status_label(msg.get("asset"), msg.get("message"), msg.get("color"))
                 elif msg_type == "status_sim": self.sim_status_label.config(text=msg.get("message", "??"), foreground=self.style.lookup(f"{msg.get('color','grey').title()}.TLabel", "foreground", default=self.fg_color))
                 elif msg_type == "sim_result": self._add_result_to_display(msg.get("data")); self.sim_button.config(state=tk.NORMAL) # Reativa botão pós-simulação
-                else: logger.warning(f"Mensagem desconhecida na fila: {msg}")
+                else: logger.warning("Mensagem desconhecida na fila: %s", msg)
 
         except Empty: pass # Fila vazia
         except Exception as e: logger.warning(f"Erro processar fila GUI: {e}", exc_info=True)
-        finally: self.after(100, self._process_queue) # Reagenda
+
+    def _process_queue(self):
+        """Polling de segurança da fila (caso algum <<QueueItem>> se perca)."""
+        try: self._drain_queue()
+        finally: self.after(500, self._process_queue) # Reagenda
 
 
     def _update_asset_card(self, asset_symbol, data):
@@ -642,6 +680,8 @@ class UnifiedDashboard(tk.Tk):
         if messagebox.askokcancel("Sair", "Deseja fechar? O monitoramento será interrompido e o log salvo."):
             # Para o auto-refresh imediatamente
             self._stop_auto_refresh()
+            self._tick_pool.shutdown(wait=False, cancel_futures=True)
+            self._pool.shutdown(wait=False, cancel_futures=True)
 
             # Para o LiveTrader (se iniciado)
             # Verifica se a engine foi instanciada antes de chamar stop
@@ -649,8 +689,8 @@ class UnifiedDashboard(tk.Tk):
                 logger.info("Solicitando parada do LiveTrader...")
                 self.trader_engine.stop() # stop() agora espera as threads
 
-            # Salva o log ANTES de fechar o SimulationEngine (que pode fechar conexão MT5)
-            self._save_log_to_csv()
+            # Fecha o log ANTES de fechar o SimulationEngine (que pode fechar conexão MT5)
+            self._close_log_file()
 
             # Fecha engine de simulação
             if self.simulation_engine and hasattr(self.simulation_engine, 'close'):
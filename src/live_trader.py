@@ -1,6 +1,10 @@
 # src/live_trader.py
 
 import yaml
+try: # LibYAML (C) quando disponível; parser puro-Python como fallback
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 import logging
 from pathlib import Path
 import importlib
@@ -38,9 +42,10 @@ def _get_mt5_timeframe_from_string(tf_str: str):
 # --- Classe LiveTrader ---
 class LiveTrader:
     """ Motor backend para execução de estratégias em tempo real via MT5. """
-    def __init__(self, config_path: str = 'configs/main.yaml', callback=None):
+    def __init__(self, config_path: str = 'configs/main.yaml', callback=None, config: dict = None):
         self.config_path = config_path
-        self.config = self._load_config()
+        # config já carregado (ex.: pelo dashboard) evita reabrir e reparsear o YAML
+        self.config = config if config is not None else self._load_config()
         self.models_dir = Path(self.config.get('global_settings', {}).get('models_directory', 'models'))
         self.callback = callback # Função para enviar atualizações para a GUI
 
@@ -54,6 +59,7 @@ class LiveTrader:
         self._init_thread = None # Thread de inicialização
         self._stop_event = Event() # Sinalizador para parar threads
         self._lock = Lock() # Protege dados compartilhados
+        self._connected_evt = Event() # Estado da conexão MT5 para leitores sem lock (ex.: monitor da GUI)
 
         self.is_trader_initialized = False # Indica se init concluiu (com ou sem sucesso)
 
@@ -75,25 +81,27 @@ class LiveTrader:
         logger.info(f"Carregando config: {self.config_path}")
         try:
             with open(self.config_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
+                return yaml.load(f, Loader=_YamlLoader)
         except FileNotFoundError: logger.critical(f"CRÍTICO: Config não encontrado: {self.config_path}"); raise
         except yaml.YAMLError as e: logger.critical(f"CRÍTICO: Erro ao carregar YAML: {e}"); raise
 
     def _initialize_mt5(self):
          """Inicializa conexão com MT5 (thread-safe)."""
          with self._lock: # Garante acesso exclusivo ao provider
-             if self.mt5_provider and self.mt5_provider.is_connected(): return True
+             if self.mt5_provider and self.mt5_provider.is_connected(): self._connected_evt.set(); return True
          logger.info("Tentando inicializar conexão MT5...")
          try:
              provider = get_provider_instance("MetaTrader5") # Pode levantar ValueError
              if isinstance(provider, MetaTraderProvider) and provider.is_connected():
                   with self._lock: self.mt5_provider = provider
+                  self._connected_evt.set()
                   logger.info("Conectado ao MetaTrader 5.")
                   return True
-             else: logger.error("Falha ao conectar instância MetaTraderProvider."); return False
+             else: logger.error("Falha ao conectar instância MetaTraderProvider."); self._connected_evt.clear(); return False
          except Exception as e:
              logger.error(f"Exceção ao inicializar MT5: {e}", exc_info=False)
              with self._lock: self.mt5_provider = None # Garante que está None
+             self._connected_evt.clear()
              return False
 
     def _load_asset_resources(self, asset_symbol: str, asset_config: dict):
@@ -221,6 +229,7 @@ class LiveTrader:
         """Busca candles recentes do MT5 (thread-safe)."""
         with self._lock: provider = self.mt5_provider
         if not provider or not provider.is_connected():
+            self._connected_evt.clear() # Conexão caiu: leitores sem lock (GUI) passam a ver desconectado
             # logger.debug("MT5 não conectado, tentando reconectar para buscar candles...")
             if not self._initialize_mt5(): return pd.DataFrame() # Falha ao reconectar
             with self._lock: provider = self.mt5_provider # Pega nova instância
@@ -240,7 +249,7 @@ class LiveTrader:
         if (sl_pct is None and tp_pct is None) or not entry_price or entry_price <= 0: return
 
         with self._lock: provider = self.mt5_provider # Pega provider seguro
-        if not provider or not provider.is_connected(): return
+        if not provider or not provider.is_connected(): self._connected_evt.clear(); return
 
         current_tick = None
         try: current_tick = mt5.symbol_info_tick(live_ticker)
@@ -424,6 +433,7 @@ class LiveTrader:
 
         # Verifica estado após init
         with self._lock: is_connected = self.mt5_provider is not None and self.mt5_provider.is_connected()
+        if not is_connected: self._connected_evt.clear()
         if not self.is_trader_initialized or not is_connected:
              logger.error("LiveTrader não inicializado ou MT5 desconectado. Não é possível iniciar.")
              if self.callback: self.callback({"type": "status", "asset": "GLOBAL", "message": "Falha Init/MT5", "color": "red"})
@@ -468,6 +478,7 @@ class LiveTrader:
 
     def _shutdown_mt5(self):
         """Desconecta do MT5 (thread-safe)."""
+        self._connected_evt.clear()
         with self._lock:
              provider = self.mt5_provider
              if provider:
@@ -8,6 +8,7 @@ Responsável por orquestrar a execução de ordens baseada em:
 
 Principais métodos:
  - update: processa cada candle cronologicamente
+ - run_batch: processa uma sequência de candles (sinal pré-computado vetorizado; mesma transição de update)
  - get_summary: retorna estatísticas agregadas
  - reset: recomeça a simulação mantendo configurações
 
@@ -17,7 +18,7 @@ OBS: Esta classe NÃO carrega dados nem modelos. É orquestrada externamente.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence
 import pandas as pd
 import numpy as np
 from datetime import datetime, time
@@ -25,6 +26,11 @@ from datetime import datetime, time
 from src.utils.logger import logger  # Logger central do projeto
 
 
+def _is_entry_signal(signal_prob, threshold: float):
+    """Predicado único de sinal de entrada (escalar em update, vetorizado em run_batch). NaN (warm-up das features) = sem sinal."""
+    return signal_prob > threshold
+
+
 @dataclass
 class TradeRecord:
     entry_time: datetime
@@ -104,6 +110,49 @@ class DayTradeEngine:
             atr: valor corrente do ATR
             ema_trend: valor da EMA usada como filtro de tendência
         """
+        self._step(timestamp, high, low, close, signal_prob, _is_entry_signal(signal_prob, self.threshold), atr, ema_trend)
+
+    def run_batch(
+        self,
+        ts: Sequence[datetime],
+        open_: Sequence[float],
+        high: Sequence[float],
+        low: Sequence[float],
+        close: Sequence[float],
+        signal_prob: Sequence[float],
+        atr: Sequence[float],
+        ema_trend: Sequence[float],
+    ) -> None:
+        """Processa uma sequência de candles; equivale a chamar update() para cada um.
+
+        Só o sinal de entrada é pré-computado de forma vetorizada; a transição por candle
+        é a mesma de update() (_step). Chamadas sucessivas (ex.: em blocos, para
+        progresso/cancelamento) continuam de onde pararam.
+        """
+        def _as_list(values):
+            return values.tolist() if hasattr(values, "tolist") else list(values)
+
+        probs = np.asarray(signal_prob, dtype=np.float64)
+        entry_signals = _is_entry_signal(probs, self.threshold).tolist()
+        highs, lows, closes = _as_list(high), _as_list(low), _as_list(close)
+        atrs, emas, probs = _as_list(atr), _as_list(ema_trend), probs.tolist()
+
+        step = self._step
+        for i, t in enumerate(ts):
+            step(t, highs[i], lows[i], closes[i], probs[i], entry_signals[i], atrs[i], emas[i])
+
+    def _step(
+        self,
+        timestamp: datetime,
+        high: float,
+        low: float,
+        close: float,
+        signal_prob: float,
+        has_signal: bool,
+        atr: float,
+        ema_trend: float,
+    ) -> None:
+        """Transição de estado de um candle (compartilhada por update e run_batch)."""
         # 1. Encerramento forçado (EOD)
         if self._is_after_eod(timestamp):
             if self.position != 0:
@@ -118,7 +167,7 @@ class DayTradeEngine:
 
         # 3. Lógica de entrada (apenas se flat e antes do limite de novas entradas)
         if self.position == 0 and self._can_open_new_position(timestamp):
-            self._check_entry(timestamp, close, signal_prob, atr, ema_trend)
+            self._check_entry(timestamp, close, signal_prob, has_signal, atr, ema_trend)
 
         # 4. Registrar equity (após potenciais mudanças)
         self._append_equity(timestamp)
@@ -131,6 +180,7 @@ class DayTradeEngine:
         timestamp: datetime,
         price: float,
         signal_prob: float,
+        has_signal: bool,
         atr: float,
         ema_trend: float,
     ) -> None:
@@ -138,7 +188,7 @@ class DayTradeEngine:
         if not self._is_within_trading_hours(timestamp):
             return
 
-        if signal_prob <= self.threshold:
+        if not has_signal:
             return
 
         if price > ema_trend:
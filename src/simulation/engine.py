@@ -1,5 +1,9 @@
 # src/simulation/engine.py
 import yaml
+try: # LibYAML (C) quando disponível; parser puro-Python como fallback
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 import logging
 from pathlib import Path
 import importlib
@@ -40,7 +44,7 @@ class SimulationEngine:
     """
     Motor de Simulação para avaliar estratégias de trading ponto a ponto no tempo.
     """
-    def __init__(self, config_path: str = 'configs/main.yaml'):
+    def __init__(self, config_path: str = 'configs/main.yaml', config: dict = None):
         # Resolve caminhos relativos em relação à raiz do projeto (…/wtnps-trade)
         project_root = Path(__file__).resolve().parents[2]
         cfg_path = Path(config_path)
@@ -48,7 +52,8 @@ class SimulationEngine:
             cfg_path = (project_root / cfg_path).resolve()
         self.config_path = str(cfg_path)
 
-        self.config = self._load_config()
+        # config já carregado (ex.: pelo dashboard) evita reabrir e reparsear o YAML
+        self.config = config if config is not None else self._load_config()
         self.asset_resources = {} # Cache de recursos por ativo (ticker)
         self.data_providers = {} # Cache de instâncias de provedores
 
@@ -74,7 +79,7 @@ class SimulationEngine:
         logger.info(f"Carregando config: {self.config_path}")
         try:
             with open(self.config_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
+                return yaml.load(f, Loader=_YamlLoader)
         except FileNotFoundError:
             logger.critical(f"CRÍTICO: Config não encontrado: {self.config_path}")
             raise
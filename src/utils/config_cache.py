@@ -0,0 +1,68 @@
+# src/utils/config_cache.py
+"""
+Carga do config YAML com cache opcional em sidecar JSON, compartilhada pelos dashboards.
+
+Com WTNPS_YAML_CACHE=1, o YAML parseado é gravado em <config>.yaml.cache.json. A primeira
+linha do sidecar é um cabeçalho {"mtime": ..., "size": ...} do YAML de origem; o cache só é
+usado se bater com o os.stat atual (json.load é bem mais rápido que o parser YAML).
+Configs que não sobrevivem ao round-trip JSON (chaves não-str, datas etc.) nunca são cacheados.
+"""
+import json
+import logging
+import os
+from pathlib import Path
+
+import yaml
+try: # LibYAML (C) quando disponível; parser puro-Python como fallback
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+logger = logging.getLogger(__name__)
+
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+
+def _json_round_trip_safe(obj) -> bool:
+    """True se json.loads(json.dumps(obj)) devolve o mesmo objeto (chaves str, tipos JSON nativos)."""
+    if isinstance(obj, dict):
+        return all(isinstance(k, str) and _json_round_trip_safe(v) for k, v in obj.items())
+    if isinstance(obj, list):
+        return all(_json_round_trip_safe(v) for v in obj)
+    return isinstance(obj, _JSON_SCALARS)
+
+
+def load_yaml_config(path):
+    """Carrega o config YAML, passando pelo sidecar JSON quando WTNPS_YAML_CACHE=1."""
+    use_sidecar = os.environ.get("WTNPS_YAML_CACHE") == "1"
+    if use_sidecar:
+        st = os.stat(path)
+        header = {"mtime": st.st_mtime_ns, "size": st.st_size}
+        cache_path = Path(path).with_suffix(".yaml.cache.json")
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                if json.loads(f.readline()) == header:
+                    config = json.load(f)
+                    logger.info("Config carregado do cache JSON: %s", cache_path)
+                    return config
+        except FileNotFoundError: pass
+        except (OSError, ValueError) as e: logger.warning("Cache JSON do config inválido (%s), reparseando YAML: %s", cache_path, e)
+
+    with open(path, 'r', encoding='utf-8') as f: config = yaml.load(f, Loader=_YamlLoader)
+    logger.info("Config carregado do YAML: %s", path)
+    if not use_sidecar: return config
+    if not _json_round_trip_safe(config):
+        logger.info("Config com tipos sem equivalente JSON exato (ex.: chaves int, datas); cache JSON não gravado.")
+        return config
+
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(header) + "\n")
+            json.dump(config, f)
+        os.replace(tmp_path, cache_path) # Troca atômica: leitores nunca veem o sidecar pela metade
+    except OSError as e:
+        logger.warning("Não foi possível gravar o cache JSON do config (%s): %s", cache_path, e)
+        try: os.remove(tmp_path)
+        except OSError: pass
+    return config
@@ -0,0 +1,37 @@
+"""
+Testes do cache JSON do config YAML (src.utils.config_cache).
+"""
+
+from src.utils.config_cache import load_yaml_config
+
+
+def _write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_sidecar_disabled_by_default(tmp_path, monkeypatch):
+    monkeypatch.delenv("WTNPS_YAML_CACHE", raising=False)
+    cfg = _write(tmp_path / "main.yaml", "a: 1\n")
+    assert load_yaml_config(cfg) == {"a": 1}
+    assert not (tmp_path / "main.yaml.cache.json").exists()
+
+
+def test_sidecar_round_trip_and_invalidation(tmp_path, monkeypatch):
+    monkeypatch.setenv("WTNPS_YAML_CACHE", "1")
+    cfg = _write(tmp_path / "main.yaml", "assets: [{ticker: WDO$, enabled: true}]\n")
+    expected = {"assets": [{"ticker": "WDO$", "enabled": True}]}
+    assert load_yaml_config(cfg) == expected
+    assert (tmp_path / "main.yaml.cache.json").exists()
+    assert load_yaml_config(cfg) == expected  # servido pelo sidecar
+
+    _write(tmp_path / "main.yaml", "assets: [{ticker: WIN$, enabled: false}]\n")
+    assert load_yaml_config(cfg) == {"assets": [{"ticker": "WIN$", "enabled": False}]}
+
+
+def test_int_keys_are_not_cached(tmp_path, monkeypatch):
+    monkeypatch.setenv("WTNPS_YAML_CACHE", "1")
+    cfg = _write(tmp_path / "main.yaml", "hours: {9: open, 17: close}\n")
+    assert load_yaml_config(cfg) == {"hours": {9: "open", 17: "close"}}
+    assert not (tmp_path / "main.yaml.cache.json").exists()
+    assert load_yaml_config(cfg) == {"hours": {9: "open", 17: "close"}}
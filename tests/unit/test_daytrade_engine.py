@@ -0,0 +1,75 @@
+"""
+Testes do DayTradeEngine.
+
+Valida que run_batch (loop fundido) produz exatamente o mesmo resultado que
+chamar update() candle a candle: trades, curva de equity e estado final.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.simulation.daytrade_engine import DayTradeEngine
+
+
+def _make_bars(n_days=5, seed=42):
+    """Gera candles M5 sintéticos (08:00-18:55) com sinal e indicadores aleatórios."""
+    rng = np.random.default_rng(seed)
+    days = pd.bdate_range("2025-11-03", periods=n_days)
+    ts = pd.DatetimeIndex(
+        [d + pd.Timedelta(hours=8) + pd.Timedelta(minutes=5 * i) for d in days for i in range(132)],
+        tz="America/Sao_Paulo",
+    )
+    n = len(ts)
+    close = 5000 + np.cumsum(rng.normal(0, 2.0, n))
+    open_ = close + rng.normal(0, 1.0, n)
+    high = np.maximum(open_, close) + rng.uniform(0, 3.0, n)
+    low = np.minimum(open_, close) - rng.uniform(0, 3.0, n)
+    atr = rng.uniform(1.0, 4.0, n)
+    ema = close + rng.normal(0, 2.0, n)
+    prob = rng.uniform(0, 1, n)
+    # Probabilidades NaN (warm-up das features não descartado) devem ser tratadas como "sem sinal"
+    prob[:20] = np.nan
+    prob[rng.choice(np.arange(20, n), size=30, replace=False)] = np.nan
+    return ts.to_pydatetime(), open_, high, low, close, prob, atr, ema
+
+
+def _engine():
+    return DayTradeEngine(initial_capital=10000.0, threshold=0.7, trading_start_hour=9, trading_end_hour=17)
+
+
+def _run_sequential(bars):
+    ts, o, h, l, c, p, a, e = bars
+    engine = _engine()
+    for i in range(len(ts)):
+        engine.update(
+            timestamp=ts[i], open_p=float(o[i]), high=float(h[i]), low=float(l[i]), close=float(c[i]),
+            signal_prob=float(p[i]), atr=float(a[i]), ema_trend=float(e[i]),
+        )
+    return engine
+
+
+def _state(engine):
+    return (engine.position, engine.entry_price, engine.stop_loss, engine.take_profit,
+            engine.highest_price, engine.lowest_price, engine.entry_timestamp, engine.capital)
+
+
+@pytest.mark.parametrize("seed", [42, 7, 2024])
+@pytest.mark.parametrize("chunk", [None, 1, 37])
+def test_run_batch_matches_update(chunk, seed):
+    bars = _make_bars(seed=seed)
+    expected = _run_sequential(bars)
+    assert expected.trades, "dados sintéticos devem gerar trades"
+    nan_times = {t for t, p in zip(bars[0], bars[5]) if np.isnan(p)}
+    assert not any(tr["entry_time"] in nan_times for tr in expected.trades), "barra com prob NaN não pode abrir posição"
+
+    engine = _engine()
+    n = len(bars[0])
+    step = n if chunk is None else chunk
+    for start in range(0, n, step):
+        engine.run_batch(*(arr[start:start + step] for arr in bars))
+
+    assert engine.trades == expected.trades
+    assert engine.equity_curve == expected.equity_curve
+    assert _state(engine) == _state(expected)
+    assert engine.get_summary() == expected.get_summary()
@@ -0,0 +1,50 @@
+"""
+Testes do esquema do log CSV do UnifiedDashboard (src.gui.results_log).
+
+Garante que os resultados de simulação (SimulationEngine.run_simulation_cycle) e
+live (LiveTrader, mensagem type="update") são gravados sem perder nenhuma chave.
+"""
+
+import csv
+import io
+
+import pytest
+
+from src.gui.results_log import LOG_FIELDS, to_log_row
+
+
+def _sim_result():
+    return {
+        "type": "Simulação", "log_timestamp": "2025-11-03T12:00:00+00:00",
+        "asset": "WDO$", "datetime": "2025-11-03 12:00 UTC", "timeframe": "M5",
+        "current_price": 5432.5, "ai_signal": "COMPRA", "ai_signal_code": 2,
+        "setup_is_valid": True, "setup_details": {"ema": "ok"}, "final_signal": "COMPRA",
+        "stop_loss": 5420.0, "take_profit": 5450.0, "indicators": {"close": "5432.50000"},
+    }
+
+
+def _live_result():
+    return {
+        "type": "Live", "log_timestamp": "2025-11-03T12:05:00+00:00",
+        "asset": "WIN$", "datetime": "2025-11-03 12:05:00", "price": 128500.0,
+        "ai_signal": "VENDA", "setup_valid": False, "final_signal": "HOLD",
+        "position": "---", "setup_details": {"erro": "x"},
+    }
+
+
+@pytest.mark.parametrize("entry", [_sim_result(), _live_result()], ids=["sim", "live"])
+def test_log_row_keeps_every_key(entry):
+    original = dict(entry)
+    row = to_log_row(entry)
+    assert entry == original, "o dict original não pode ser alterado"
+
+    buf = io.StringIO()
+    # extrasaction='raise': qualquer chave fora do esquema falha aqui em vez de sumir do CSV
+    writer = csv.DictWriter(buf, fieldnames=LOG_FIELDS, extrasaction="raise")
+    writer.writeheader()
+    writer.writerow(row)
+
+    written = next(csv.DictReader(io.StringIO(buf.getvalue())))
+    for key, value in original.items():
+        col = {"indicators": "indicators_json", "setup_details": "setup_details_json"}.get(key, key)
+        assert written[col] == str(value), col